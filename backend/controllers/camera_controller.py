@@ -1,76 +1,130 @@
 from PyQt6.QtCore import QObject, pyqtSignal
-from pygrabber.dshow_graph import FilterGraph
 import logging
+import config.settings_manager as settings_manager
 from backend.utils.thread_utils import ThreadPoolManager
-from backend.utils.mp_utils import start_camera_process, clean_up_process
-from multiprocessing import Queue, Event
-from queue import Empty
+from backend.utils.mp_utils import start_camera_worker, CAM_WIDTH, CAM_HEIGHT
+from backend.utils.frame_buffer import FrameDistributor, POLICY_LATEST
+from backend.utils.frame_sources import get_source_config, list_source_devices, device_index_for
+from backend.utils.motion_gate import get_motion_config
+from multiprocessing import get_context
+import threading
 
 FRAME_INTERVAL = 1.0 / 60.0
-QUEUE_TIMEOUT = 0.1
-QUEUE_SIZE = 10
+CAMERA_START_TIMEOUT = 5.0
+FPS_REPORT_INTERVAL = 1.0
+MAX_FEEDS = 4
+PRIMARY_CAMERA_ID = 0
 
 logger = logging.getLogger("camera")
 
 def frame_update_loop(manager):
     import time
-    last_frame_time = 0
     logger.info("Frame update thread starting")
+    last_fps_report = time.time()
 
     while manager.camera_active:
-        current_time = time.time()
-        time_since_last = current_time - last_frame_time
-
-        if time_since_last < FRAME_INTERVAL:
-            time.sleep(max(0.001, FRAME_INTERVAL - time_since_last))
-            continue
-
-        try:
-            frame = manager.frame_queue.get(timeout=QUEUE_TIMEOUT)
-            manager.current_image = frame
-            manager.frame_ready.emit(frame)
-            last_frame_time = time.time()
-        except Empty:
-            time.sleep(0.01)
+        manager.frame_event.wait(FPS_REPORT_INTERVAL)
+        manager.frame_event.clear()
+        round_start = time.time()
+        with manager.feeds_lock:
+            for feed in manager.feeds.values():
+                delivery = feed.display_subscriber.poll()
+                if delivery is not None:
+                    delivery = feed.display_subscriber.snapshot(delivery)
+                if delivery is None:
+                    continue
+                feed.current_image = delivery.frame
+                manager.frame_ready.emit(feed.camera_id, delivery.frame)
+
+        if time.time() - last_fps_report >= FPS_REPORT_INTERVAL:
+            manager.fps_updated.emit(manager.capture_rates())
+            last_fps_report = time.time()
+
+        elapsed = time.time() - round_start
+        if elapsed < FRAME_INTERVAL:
+            time.sleep(FRAME_INTERVAL - elapsed)
 
     logger.info("Frame update thread stopped")
 
+class CameraFeed:
+    def __init__(self, camera_id, device_name, device_index, worker):
+        self.camera_id = camera_id
+        self.device_name = device_name
+        self.device_index = device_index
+        self.current_image = None
+        self.worker = worker
+        self.distributor = FrameDistributor(CAM_WIDTH, CAM_HEIGHT)
+        self.display_subscriber = self.distributor.open(self.distributor.subscribe("display", POLICY_LATEST))
+
+    def start(self, source_config, motion_config):
+        return self.worker.start(self.distributor.ring.spec, source_config, self.device_index, motion_config, timeout=CAMERA_START_TIMEOUT)
+
+    def release(self):
+        if self.worker:
+            if not self.worker.stop():
+                logger.warning(f"Camera {self.camera_id} worker did not acknowledge stop, shutting it down")
+                self.worker.shutdown()
+            self.worker = None
+        if self.distributor:
+            logger.info(f"Camera {self.camera_id} frame delivery stats: {self.distributor.stats()}")
+            self.distributor.close()
+            self.distributor = None
+            self.display_subscriber = None
+
 class CameraManager(QObject):
-    frame_ready = pyqtSignal(object)
+    frame_ready = pyqtSignal(int, object)
     camera_start_failed = pyqtSignal(str)
     camera_started = pyqtSignal()
     camera_stopped = pyqtSignal()
+    feed_added = pyqtSignal(int, str)
+    feed_removed = pyqtSignal(int)
+    fps_updated = pyqtSignal(dict)
 
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
-        self.current_image = None
+        self.source_config = get_source_config(settings_manager)
         self.camera_devices = self.list_cameras()
         self.selected_camera = self.camera_devices[0] if self.camera_devices else ""
         self.main_window.camera_display.camera_combo.currentIndexChanged.connect(self.on_camera_selected)
         self.camera_active = False
         self.thread_pool_manager = ThreadPoolManager()
-        self.camera_process = None
-        self.frame_queue = None
-        self.stop_event = None
+        self.feeds = {}
+        self.feeds_lock = threading.Lock()
+        self.frame_event = get_context('spawn').Event()
+        self.workers = {}
+        self._worker_for(PRIMARY_CAMERA_ID)
+
+    @property
+    def current_image(self):
+        return self.current_image_for(PRIMARY_CAMERA_ID)
+
+    def current_image_for(self, camera_id):
+        feed = self.feeds.get(camera_id)
+        return feed.current_image if feed else None
 
     def list_cameras(self):
         try:
-            graph = FilterGraph()
-            devices = graph.get_input_devices()
+            devices = list_source_devices(self.source_config)
             if not devices:
                 devices = ["No cameras found"]
-                logger.error("No cameras detected on the system")
+                logger.error(f"No cameras detected for source '{self.source_config['type']}'")
             else:
-                logger.info(f"Found {len(devices)} camera(s): {devices}")
+                logger.info(f"Found {len(devices)} camera(s) for source '{self.source_config['type']}': {devices}")
             self.main_window.camera_display.populate_camera_list(devices)
             return devices
         except Exception as e:
             logger.error(f"Failed to list cameras: {e}")
             return ["No cameras found"]
 
+    def refresh_cameras(self):
+        self.source_config = get_source_config(settings_manager)
+        self.camera_devices = self.list_cameras()
+        self.selected_camera = self.camera_devices[0] if self.camera_devices else ""
+
     def on_camera_selected(self, index):
-        self.selected_camera = self.camera_devices[index]
+        if 0 <= index < len(self.camera_devices):
+            self.selected_camera = self.camera_devices[index]
 
     def toggle_camera(self):
         self.camera_active = not self.camera_active
@@ -79,21 +133,38 @@ class CameraManager(QObject):
         else:
             self.stop_camera()
 
-    def _verify_camera_started(self):
-        import time
-        start_time = time.time()
-        timeout = 5.0
-        while time.time() - start_time < timeout:
-            if not self.camera_process.is_alive():
-                return False
-            try:
-                frame = self.frame_queue.get(timeout=QUEUE_TIMEOUT)
-                if frame is not None:
-                    self.frame_queue.put(frame)
-                    return True
-            except Empty:
-                time.sleep(0.1)
-        return False
+    def _next_camera_id(self):
+        for camera_id in range(MAX_FEEDS):
+            if camera_id not in self.feeds:
+                return camera_id
+        return None
+
+    def _worker_for(self, camera_id):
+        worker = self.workers.get(camera_id)
+        if worker is None or not worker.is_alive():
+            if worker is not None:
+                worker.shutdown()
+            worker = start_camera_worker(f"camera-{camera_id}", self.frame_event)
+            self.workers[camera_id] = worker
+        return worker
+
+    def _start_feed(self, device_name):
+        camera_id = self._next_camera_id()
+        if camera_id is None:
+            logger.warning(f"Cannot add camera {device_name}: limit of {MAX_FEEDS} feeds reached")
+            return None
+        device_index = device_index_for(self.source_config, device_name, self.camera_devices)
+        logger.info(f"Initializing camera {camera_id}: {device_name} (source: {self.source_config['type']}, index: {device_index})")
+        feed = CameraFeed(camera_id, device_name, device_index, self._worker_for(camera_id))
+        if not feed.start(self.source_config, get_motion_config(settings_manager)):
+            feed.release()
+            logger.error(f"Failed to start camera process for {device_name}")
+            return None
+        with self.feeds_lock:
+            self.feeds[camera_id] = feed
+        self.feed_added.emit(camera_id, device_name)
+        logger.info(f"Camera {camera_id} process started successfully")
+        return camera_id
 
     def use_camera(self):
         try:
@@ -101,45 +172,54 @@ class CameraManager(QObject):
                 logger.error("Cannot start camera - no cameras available")
                 return
 
-            device_index = self.camera_devices.index(self.selected_camera)
-            logger.info(f"Initializing camera: {self.selected_camera} (index: {device_index})")
-            
-            self.frame_queue = Queue(maxsize=QUEUE_SIZE)
-            self.stop_event = Event()
-            self.camera_process = start_camera_process(self.frame_queue, self.stop_event, device_index)
-            self.camera_process.start()
-            
-            if not self._verify_camera_started():
+            if self._start_feed(self.selected_camera) is None:
                 self._release_resources()
-                logger.error("Failed to start camera process")
                 self.camera_start_failed.emit("Failed to start camera process. Please check your camera connection and try again.")
                 self.camera_stopped.emit()
                 return
-                
+
             self.thread_pool_manager.run(frame_update_loop, self)
-            logger.info("Camera process started successfully")
             self.camera_started.emit()
         except Exception as e:
             logger.error(f"Error initializing camera: {e}")
             self._release_resources()
 
+    def add_feed(self):
+        if not self.camera_active:
+            return None
+        if any(feed.device_name == self.selected_camera for feed in self.feeds.values()):
+            logger.info(f"Camera {self.selected_camera} is already streaming")
+            return None
+        try:
+            camera_id = self._start_feed(self.selected_camera)
+        except Exception as e:
+            logger.error(f"Error adding camera feed: {e}")
+            camera_id = None
+        if camera_id is None:
+            self.camera_start_failed.emit(f"Failed to add camera {self.selected_camera}.")
+        return camera_id
+
+    def remove_feed(self, camera_id):
+        with self.feeds_lock:
+            feed = self.feeds.pop(camera_id, None)
+        if feed is None:
+            return
+        feed.release()
+        self.feed_removed.emit(camera_id)
+
+    def capture_rates(self):
+        with self.feeds_lock:
+            return {camera_id: feed.distributor.rates() for camera_id, feed in self.feeds.items()}
+
     def _release_resources(self):
         logger.info("Releasing camera resources")
         self.camera_active = False
+        self.frame_event.set()
         import time
         time.sleep(0.1)
 
-        if self.camera_process:
-            clean_up_process(self.camera_process, self.stop_event)
-            if self.frame_queue:
-                while not self.frame_queue.empty():
-                    try:
-                        self.frame_queue.get_nowait()
-                    except Empty:
-                        break
-            self.camera_process = None
-            self.stop_event = None
-            self.frame_queue = None
+        for camera_id in list(self.feeds):
+            self.remove_feed(camera_id)
 
         if hasattr(self, 'thread_pool_manager'):
             self.thread_pool_manager.cleanup()
@@ -158,3 +238,6 @@ class CameraManager(QObject):
     def cleanup(self):
         logger.info("Cleaning up camera resources")
         self._release_resources()
+        for worker in self.workers.values():
+            worker.shutdown()
+        self.workers = {}
@@ -1,71 +1,208 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 import logging
+import config.settings_manager as settings_manager
 from backend.utils.thread_utils import ThreadPoolManager
-from backend.utils.mp_utils import start_detection_process, clean_up_process
+from backend.utils.mp_utils import DetectionWorkerPool, ResultMailbox
 from backend.utils.deduplication_utils import DetectionDeduplicator
-from multiprocessing import Queue, Event, Value
+from backend.utils.object_tracker import ObjectTracker
+from backend.utils.confidence_filter import ConfidenceFilter, get_class_thresholds
+from backend.utils.detection_records import decode_records, records_to_predictions
+from backend.utils.frame_buffer import POLICY_LATEST
+from backend.utils.motion_gate import get_motion_config
+from backend.services.detection_backends import get_model_settings
+from backend.controllers.camera_controller import MAX_FEEDS
+from multiprocessing import get_context
 from ctypes import c_double
-from queue import Empty
 import time
 
-DETECTION_SLEEP_MS = 33
+RESULT_WAIT_TIMEOUT = 0.5
+RATE_REPORT_INTERVAL = 1.0
+DETECTION_START_TIMEOUT = 5.0
+HEALTH_CHECK_INTERVAL = 2.0
 logger = logging.getLogger("detection")
 
 class DetectionManager(QObject):
-    detections_ready = pyqtSignal(list)
+    detections_ready = pyqtSignal(int, list)
     detection_stopped = pyqtSignal()
     connection_status_changed = pyqtSignal(bool)
     detection_status_changed = pyqtSignal(str)
     detection_started = pyqtSignal()
     detection_start_failed = pyqtSignal(str)
+    detection_rate_changed = pyqtSignal(float, int)
 
-    def __init__(self, model, main_window):
+    def __init__(self, model_config, main_window):
         super().__init__()
-        self.model = model
-        self.detections = []
+        self.model_config = model_config
+        self.detections_by_camera = {}
+        self.raw_by_camera = {}
+        self.trackers = {}
+        self.deduplicators = {}
         self.main_window = main_window
         self.detection_active = False
-        self.detection_process = None
-        self.frame_queue = None
-        self.result_queue = None
-        self.stop_event = None
-        self.confidence_value = Value(c_double, self.main_window.detection_controls.get_confidence_threshold())
-        from multiprocessing import Value as MPValue
-        self.connection_state = MPValue('i', 0)
+        self.feeds_open = False
+        self.detection_feeds = set()
+        self.last_result_seq = {}
+        self.frames_skipped = 0
+        self.dedup_iou = None
+        mp_context = get_context('spawn')
+        self.result_mailboxes = [ResultMailbox() for _ in range(MAX_FEEDS)]
+        self.results_event = mp_context.Event()
+        self.confidence_value = mp_context.Value(c_double, self.main_window.detection_controls.get_confidence_threshold())
+        self.confidence_filter = ConfidenceFilter(self.confidence_value.value, get_class_thresholds(settings_manager))
+        self.connection_state = mp_context.Value('i', 0)
+        self.worker_pool = None
+        self._ensure_worker()
         self.thread_pool_manager = ThreadPoolManager()
         self.update_worker_signals = None
+        self._preload_model()
 
-    def _get_model_config(self):
-        return {'model': self.model}
+    @property
+    def detections(self):
+        return [det for detections in self.detections_by_camera.values() for det in detections]
 
-    def _start_detection_process_worker(self):
-        try:
-            self.frame_queue = self.main_window.camera_manager.frame_queue
-            if not self.frame_queue:
-                raise ValueError("Camera frame queue is not available.")
-            self.result_queue = Queue()
-            self.stop_event = Event()
-            self.confidence_value.value = self.main_window.detection_controls.get_confidence_threshold()
-            self.detection_process = start_detection_process(
-                self.frame_queue,
-                self.result_queue,
-                self.stop_event,
-                self._get_model_config(),
+    @property
+    def detection_fps(self):
+        return self.worker_pool.detection_fps() if self.worker_pool else 0.0
+
+    def detections_for(self, camera_id):
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            return self.detections_by_camera.get(camera_id, [])
+        return self.confidence_filter.apply(tracker.tracks(time.time()))
+
+    def deduplicator_for(self, camera_id):
+        deduplicator = self.deduplicators.get(camera_id)
+        if deduplicator is None:
+            deduplicator = self.deduplicators.setdefault(camera_id, DetectionDeduplicator(self.dedup_iou, camera_id))
+        return deduplicator
+
+    def _end_dedup_session(self, camera_id):
+        deduplicator = self.deduplicators.pop(camera_id, None)
+        if deduplicator is not None:
+            logger.info(f"Camera {camera_id} dedup session ended with {len(deduplicator)} active deadzone(s)")
+            deduplicator.clear()
+
+    def _reset_tracker(self, camera_id):
+        tracker = self.trackers.pop(camera_id, None)
+        if tracker is not None:
+            tracker.reset()
+
+    def set_model(self, model_config):
+        changed = model_config != self.model_config
+        pool = self.worker_pool
+        self.model_config = model_config
+        if changed and pool:
+            pool.invalidate()
+        self._ensure_worker()
+        if changed or self.worker_pool is not pool:
+            self._preload_model()
+        else:
+            logger.info("Detection model unchanged, keeping warm workers")
+
+    def _preload_model(self):
+        if self.model_config and not self.detection_active:
+            self.thread_pool_manager.run(self._warm_worker_pool)
+
+    def _warm_worker_pool(self):
+        started = time.perf_counter()
+        if self.worker_pool.reconfigure(self.model_config):
+            logger.info(f"Detection workers preloaded in {time.perf_counter() - started:.2f}s")
+        else:
+            logger.warning("Detection worker preload failed, the model will be loaded on start")
+
+    def _get_run_options(self):
+        model_settings = get_model_settings(settings_manager)
+        return {
+            'motion_refresh': get_motion_config(settings_manager)['refresh_interval'],
+            'max_in_flight': model_settings['max_in_flight'],
+            'confidence_floor': model_settings['confidence_floor'],
+            'target_fps': model_settings['target_fps'],
+            'max_age': model_settings['max_age'],
+            'cache_threshold': model_settings['cache_threshold'],
+            'cache_ttl': model_settings['cache_ttl'],
+            'tile_grid': model_settings['tile_grid'],
+            'tile_overlap': model_settings['tile_overlap']
+        }
+
+    def _ensure_worker(self):
+        workers = get_model_settings(settings_manager)['workers']
+        if self.worker_pool is not None and self.worker_pool.size != workers and not self.detection_active:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
+        if self.worker_pool is None:
+            self.worker_pool = DetectionWorkerPool(
+                workers,
+                self.result_mailboxes,
+                self.results_event,
                 self.confidence_value,
                 self.connection_state
             )
-            self.detection_process.start()
-            logger.info("Detection process started successfully via worker.")
+            logger.info(f"Detection worker pool created with {workers} worker(s)")
+        self.worker_pool.ensure()
+        return self.worker_pool
+
+    def add_feed(self, camera_id, device_name=""):
+        if not self.feeds_open or camera_id in self.detection_feeds:
+            return
+        feed = self.main_window.camera_manager.feeds.get(camera_id)
+        if feed is None or feed.distributor is None:
+            return
+        self.worker_pool.add_feed(camera_id, [feed.distributor.subscribe(f"detection-{index}", POLICY_LATEST) for index in range(self.worker_pool.size)])
+        self.detection_feeds.add(camera_id)
+        logger.info(f"Camera {camera_id} {device_name} added to detection")
+
+    def remove_feed(self, camera_id):
+        if camera_id not in self.detection_feeds:
+            return
+        self.detection_feeds.discard(camera_id)
+        self.worker_pool.remove_feed(camera_id)
+        feed = self.main_window.camera_manager.feeds.get(camera_id)
+        if feed is not None and feed.distributor is not None:
+            for index in range(self.worker_pool.size):
+                feed.distributor.unsubscribe(f"detection-{index}")
+        self.detections_by_camera.pop(camera_id, None)
+        self.raw_by_camera.pop(camera_id, None)
+        self._reset_tracker(camera_id)
+        self._end_dedup_session(camera_id)
+        self.last_result_seq.pop(camera_id, None)
+
+    def _release_feeds(self):
+        for camera_id in list(self.detection_feeds):
+            self.remove_feed(camera_id)
+        self.feeds_open = False
+
+    def _start_detection_worker(self):
+        try:
+            if not self.main_window.camera_manager.feeds:
+                raise ValueError("No camera feeds are available.")
+            pool = self._ensure_worker()
+            if not pool.reconfigure(self.model_config):
+                raise RuntimeError("Detection worker rejected the model configuration.")
+            for mailbox in self.result_mailboxes:
+                mailbox.clear()
+            self.last_result_seq = {}
+            self.frames_skipped = 0
+            self.confidence_value.value = self.main_window.detection_controls.get_confidence_threshold()
+            self.confidence_filter.default = self.confidence_value.value
+            self.confidence_filter.set_class_thresholds(get_class_thresholds(settings_manager))
+            self.dedup_iou = get_model_settings(settings_manager)['dedup_iou']
+            for camera_id in list(self.deduplicators):
+                self._end_dedup_session(camera_id)
+            self.feeds_open = True
+            for camera_id, feed in list(self.main_window.camera_manager.feeds.items()):
+                self.add_feed(camera_id, feed.device_name)
+            if not pool.start(self._get_run_options(), timeout=DETECTION_START_TIMEOUT):
+                raise RuntimeError("Detection worker did not start.")
+            logger.info(f"Detection started on {pool.size} worker(s) ({len(self.detection_feeds)} feed(s)).")
             return True
         except Exception as e:
-            logger.error(f"Failed to start detection process in worker: {str(e)}")
-            self.detection_process = None
-            self.frame_queue = None
-            self.result_queue = None
-            self.stop_event = None
+            logger.error(f"Failed to start detection worker: {str(e)}")
+            if self.worker_pool:
+                self.worker_pool.stop()
+            self._release_feeds()
             return False
 
-    def _on_detection_process_started(self, success):
+    def _on_detection_worker_started(self, success):
         if success:
             self.detection_active = True
             self.main_window.detection_controls.update_detection_button_text(True)
@@ -95,8 +232,8 @@ class DetectionManager(QObject):
         should_start = not self.detection_active
         if should_start:
             logger.info("Attempting to start detection...")
-            worker_signals = self.thread_pool_manager.run(self._start_detection_process_worker)
-            worker_signals.result.connect(self._on_detection_process_started)
+            worker_signals = self.thread_pool_manager.run(self._start_detection_worker)
+            worker_signals.result.connect(self._on_detection_worker_started)
             worker_signals.error.connect(self._on_detection_start_error)
         else:
             logger.info("Attempting to stop detection...")
@@ -109,25 +246,21 @@ class DetectionManager(QObject):
             return
 
         self.detection_active = False
-        if self.detection_process:
-            import time
-            time.sleep(0.1)
-            
-            clean_up_process(self.detection_process, self.stop_event)
-            self.detection_process = None
-            self.stop_event = None
-            
-            if self.result_queue:
-                while not self.result_queue.empty():
-                    try:
-                        self.result_queue.get_nowait()
-                    except Empty:
-                        break
-                self.result_queue = None
-
-        self.frame_queue = None
-        self.detections = []
+        self.results_event.set()
+        if self.worker_pool:
+            logger.info(f"Detection worker health: {self.worker_pool.stats()}, {self.frames_skipped} frame(s) skipped this session")
+            self.worker_pool.stop()
+
+        for mailbox in self.result_mailboxes:
+            mailbox.clear()
+
+        self._release_feeds()
+        self.detections_by_camera = {}
+        self.raw_by_camera = {}
+        for camera_id in list(self.trackers):
+            self._reset_tracker(camera_id)
         
+        self.detection_rate_changed.emit(0.0, 0)
         if hasattr(self, "detection_stopped"):
             self.detection_stopped.emit()
             
@@ -136,6 +269,9 @@ class DetectionManager(QObject):
     def update_confidence_threshold(self, new_value):
         if hasattr(self, 'confidence_value') and self.confidence_value:
             self.confidence_value.value = new_value
+        self.confidence_filter.default = new_value
+        for camera_id, raw_detections in list(self.raw_by_camera.items()):
+            self.detections_by_camera[camera_id] = self.confidence_filter.apply(raw_detections)
 
     def _result_update_loop(self):
         logger.info("Detection update thread starting")
@@ -144,10 +280,15 @@ class DetectionManager(QObject):
         last_detection_time = time.time()
         detection_timeout = 2.5
         detections_cleared = False
+        last_rate_report = time.time()
+        last_health_check = time.time()
 
         while self.detection_active:
-            if not hasattr(self, "detections_ready") or not hasattr(self, "main_window") or not self.result_queue:
-                time.sleep(0.1)
+            self.results_event.wait(RESULT_WAIT_TIMEOUT)
+            self.results_event.clear()
+            if not self.detection_active:
+                break
+            if not hasattr(self, "detections_ready") or not hasattr(self, "main_window") or not self.result_mailboxes:
                 continue
 
             status_val = self.connection_state.value if hasattr(self, "connection_state") else 1
@@ -160,32 +301,59 @@ class DetectionManager(QObject):
 
             new_detection = False
             try:
-                if not self.result_queue.empty():
-                    predictions = self.result_queue.get_nowait()
+                for camera_id in list(self.detection_feeds):
+                    result = self.result_mailboxes[camera_id].take()
+                    if result is None or result['seq'] <= self.last_result_seq.get(camera_id, 0):
+                        continue
+                    self.last_result_seq[camera_id] = result['seq']
+                    self.frames_skipped += result['skipped']
+                    logger.debug(f"Camera {camera_id} result for frame {result['seq']}: age {(time.time() - result['timestamp']) * 1000:.0f} ms, {result['skipped']} frame(s) skipped")
                     capture_class = self.main_window.detection_controls.get_selected_capture_class()
-                    self.detections = DetectionDeduplicator.deduplicate(predictions, capture_class)
-                    self.detections_ready.emit(self.detections)
+                    predictions = records_to_predictions(decode_records(result['records']), result['classes'])
+                    raw_detections = self.deduplicator_for(camera_id).deduplicate(predictions, capture_class)
+                    detections = self.confidence_filter.apply(raw_detections)
+                    self.raw_by_camera[camera_id] = raw_detections
+                    self.detections_by_camera[camera_id] = detections
+                    self.trackers.setdefault(camera_id, ObjectTracker()).update(raw_detections, result['timestamp'])
+                    self.detections_ready.emit(camera_id, detections)
                     last_detection_time = time.time()
                     detections_cleared = False
                     new_detection = True
-            except Empty:
-                pass
             except Exception as e:
                  logger.error(f"Error processing detection results: {str(e)}")
 
 
             now = time.time()
+            if now - last_rate_report >= RATE_REPORT_INTERVAL:
+                self.detection_rate_changed.emit(self.detection_fps, self.frames_skipped)
+                last_rate_report = now
+            if now - last_health_check >= HEALTH_CHECK_INTERVAL:
+                self._check_worker_health()
+                last_health_check = now
             if not new_detection and status_str in ("retrying", "disconnected"):
                 if now - last_detection_time > detection_timeout and not detections_cleared:
-                    self.detections = []
-                    self.detections_ready.emit([])
+                    for camera_id in list(self.detections_by_camera):
+                        self.detections_by_camera[camera_id] = []
+                        self.raw_by_camera.pop(camera_id, None)
+                        self._reset_tracker(camera_id)
+                        self.detections_ready.emit(camera_id, [])
                     detections_cleared = True
 
-            time.sleep(DETECTION_SLEEP_MS / 1000.0)
-
         logger.info("Detection update thread stopped")
 
+    def _check_worker_health(self):
+        try:
+            restarted = self.worker_pool.check_health(self.model_config, self._get_run_options())
+        except Exception as e:
+            logger.error(f"Detection worker health check failed: {str(e)}")
+            return
+        if restarted:
+            logger.warning(f"Restarted {restarted} detection worker(s), {self.worker_pool.restarts} restart(s) this session")
+
     def cleanup(self):
         self.stop_detection()
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+            self.worker_pool = None
         self.thread_pool_manager.cleanup()
         logger.info("DetectionManager cleaned up.")
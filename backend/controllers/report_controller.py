@@ -43,12 +43,15 @@ def save_pdf_with_details(details):
         y_positions = [pdf.get_y() + 10, pdf.get_y() + 110]
         if not os.path.exists("tempcaptures"):
             return False
-        captures = [f for f in os.listdir("tempcaptures") if f.endswith(".jpg")]
-        for filename in captures:
+        captures = [
+            (os.path.join(directory, f), f)
+            for directory, _, filenames in sorted(os.walk("tempcaptures"))
+            for f in sorted(filenames) if f.endswith(".jpg")
+        ]
+        for image_path, filename in captures:
             if image_count > 0 and image_count % 4 == 0:
                 pdf.add_page()
                 y_positions = [pdf.get_y() + 10, pdf.get_y() + 110]
-            image_path = os.path.join("tempcaptures", filename)
             x = x_positions[image_count % 2]
             y = y_positions[(image_count // 2) % 2]
             pdf.image(image_path, x=x, y=y, w=90, h=90)
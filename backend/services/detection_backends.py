@@ -0,0 +1,309 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import ast
+import importlib.util
+import logging
+import os
+import time
+import numpy as np
+from backend.utils.detection_scheduler import DEFAULT_TARGET_FPS, DEFAULT_MAX_AGE
+from backend.utils.prediction_cache import DEFAULT_HASH_THRESHOLD, DEFAULT_CACHE_TTL
+from backend.utils.confidence_filter import DEFAULT_CONFIDENCE_FLOOR
+from backend.utils.letterbox import LetterboxPool, LETTERBOX_FILL, parse_input_size
+from backend.utils.detection_records import ClassTable, empty_records, records_from_arrays, records_from_predictions, record_corners
+
+LOGGER = logging.getLogger("detection")
+
+BACKEND_ROBOFLOW = "roboflow"
+BACKEND_ONNX = "onnx"
+BACKEND_MOCK = "mock"
+BACKEND_TYPES = [BACKEND_ROBOFLOW, BACKEND_ONNX, BACKEND_MOCK]
+
+DEFAULT_HOSTED_INPUT_SIZE = (320, 320)
+DEFAULT_ONNX_INPUT_SIZE = (640, 640)
+DEFAULT_OVERLAP = 0.5
+DEFAULT_MAX_IN_FLIGHT = 3
+DEFAULT_DETECTION_WORKERS = 1
+MAX_DETECTION_WORKERS = 8
+DEFAULT_JPEG_QUALITY = 80
+DEFAULT_TILE_GRID = (1, 1)
+DEFAULT_TILE_OVERLAP = 0.2
+MAX_TILE_GRID = 4
+TILE_STATS_LOG_INTERVAL = 100
+DEFAULT_WARMUP_RUNS = 3
+HOSTED_WARMUP_RUNS = 1
+
+def _parse_tile_grid(value):
+    columns, rows = (int(part) for part in str(value).lower().split("x"))
+    if not (1 <= columns <= MAX_TILE_GRID and 1 <= rows <= MAX_TILE_GRID):
+        raise ValueError(f"Tile grid out of range: {value}")
+    return columns, rows
+
+def _default_input_size(backend):
+    return DEFAULT_ONNX_INPUT_SIZE if backend == BACKEND_ONNX else DEFAULT_HOSTED_INPUT_SIZE
+
+def read_setting(section, key, parse, default, section_name="model", logger=LOGGER):
+    value = section.get(key)
+    if value is None or str(value).strip() == "":
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        logger.warning(f"Invalid [{section_name}] setting {key} = '{value}', using default {default}")
+        return default
+
+def get_model_settings(settings_manager):
+    section = settings_manager.get_setting("model") or {}
+    backend = section.get("backend") or BACKEND_ROBOFLOW
+    if backend not in BACKEND_TYPES:
+        LOGGER.warning(f"Unknown detection backend '{backend}', falling back to {BACKEND_ROBOFLOW}")
+        backend = BACKEND_ROBOFLOW
+    cpu_count = os.cpu_count() or 1
+    input_size = read_setting(section, "input_size", parse_input_size, _default_input_size(backend))
+    max_in_flight = read_setting(section, "max_in_flight", lambda value: max(1, int(value)), DEFAULT_MAX_IN_FLIGHT)
+    workers = read_setting(section, "workers", lambda value: min(cpu_count, MAX_DETECTION_WORKERS, max(1, int(value))), DEFAULT_DETECTION_WORKERS)
+    confidence_floor = read_setting(section, "confidence_floor", lambda value: min(1.0, max(0.0, float(value))), DEFAULT_CONFIDENCE_FLOOR)
+    jpeg_quality = read_setting(section, "jpeg_quality", lambda value: min(100, max(1, int(value))), DEFAULT_JPEG_QUALITY)
+    target_fps = read_setting(section, "target_fps", float, DEFAULT_TARGET_FPS)
+    max_age = read_setting(section, "max_age", float, DEFAULT_MAX_AGE)
+    cache_threshold = read_setting(section, "cache_threshold", int, DEFAULT_HASH_THRESHOLD)
+    cache_ttl = read_setting(section, "cache_ttl", float, DEFAULT_CACHE_TTL)
+    tile_grid = read_setting(section, "tiles", _parse_tile_grid, DEFAULT_TILE_GRID)
+    tile_overlap = read_setting(section, "tile_overlap", lambda value: min(0.5, max(0.0, float(value))), DEFAULT_TILE_OVERLAP)
+    dedup_iou = read_setting(section, "dedup_iou", lambda value: min(1.0, max(0.0, float(value))), 0.0)
+    return {
+        'backend': backend,
+        'path': section.get("path", ""),
+        'input_size': input_size,
+        'max_in_flight': max_in_flight,
+        'workers': workers,
+        'confidence_floor': confidence_floor,
+        'jpeg_quality': jpeg_quality,
+        'target_fps': target_fps,
+        'max_age': max_age,
+        'cache_threshold': cache_threshold,
+        'cache_ttl': cache_ttl,
+        'tile_grid': tile_grid,
+        'tile_overlap': tile_overlap,
+        'dedup_iou': dedup_iou or None
+    }
+
+def onnxruntime_available():
+    return importlib.util.find_spec("onnxruntime") is not None
+
+def non_max_suppression(boxes, scores, iou_threshold):
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        best = order[0]
+        keep.append(best)
+        rest = order[1:]
+        inter_w = np.clip(np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest]), 0, None)
+        inter_h = np.clip(np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest]), 0, None)
+        inter = inter_w * inter_h
+        iou = inter / (areas[best] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.array(keep, dtype=np.int64)
+
+class DetectionBackend:
+    name = ""
+    concurrent = False
+    class_table = None
+
+    def predict(self, frame, confidence, overlap=DEFAULT_OVERLAP):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class RoboflowBackend(DetectionBackend):
+    name = BACKEND_ROBOFLOW
+    concurrent = True
+
+    def __init__(self, client, classes=(), input_size=DEFAULT_HOSTED_INPUT_SIZE):
+        self.client = client
+        self.class_table = ClassTable(classes)
+        self.letterboxes = LetterboxPool(*input_size)
+
+    def predict(self, frame, confidence, overlap=DEFAULT_OVERLAP):
+        letterbox = self.letterboxes.get()
+        records = records_from_predictions(self.client.predict(letterbox.apply(frame), confidence, overlap).get('predictions', []), self.class_table)
+        return letterbox.invert(records)
+
+    def close(self):
+        self.client.close()
+
+class OnnxBackend(DetectionBackend):
+    name = BACKEND_ONNX
+
+    def __init__(self, path, classes, input_size=DEFAULT_ONNX_INPUT_SIZE, threads=0, optimized_path=None, save_optimized=False):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        session_path = path
+        if optimized_path and Path(optimized_path).is_file():
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            session_path = optimized_path
+        elif optimized_path and save_optimized:
+            options.optimized_model_filepath = str(optimized_path)
+        started = time.perf_counter()
+        self.session = ort.InferenceSession(str(session_path), sess_options=options, providers=["CPUExecutionProvider"])
+        self.load_time = time.perf_counter() - started
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        self.input_width = width if isinstance(width, int) else input_size[0]
+        self.input_height = height if isinstance(height, int) else input_size[1]
+        self.letterboxes = LetterboxPool(self.input_width, self.input_height)
+        self.classes = self._read_class_names() or list(classes)
+        self.class_table = ClassTable(self.classes)
+        LOGGER.info(f"ONNX model loaded: {Path(session_path).name} in {self.load_time * 1000:.0f} ms ({self.input_width}x{self.input_height}, {len(self.classes)} classes)")
+
+    def _read_class_names(self):
+        names = self.session.get_modelmeta().custom_metadata_map.get("names")
+        if not names:
+            return []
+        try:
+            parsed = ast.literal_eval(names)
+        except (ValueError, SyntaxError):
+            return []
+        if isinstance(parsed, dict):
+            return [parsed[key] for key in sorted(parsed)]
+        return list(parsed)
+
+    def _decode(self, output):
+        rows = output[0]
+        class_count = len(self.classes)
+        expected_columns = (4 + class_count, 5 + class_count)
+        if rows.shape[1] not in expected_columns and (rows.shape[0] in expected_columns or rows.shape[0] < rows.shape[1]):
+            rows = rows.T
+        if class_count and rows.shape[1] == 5 + class_count:
+            class_scores = rows[:, 5:] * rows[:, 4:5]
+        else:
+            class_scores = rows[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(rows)), class_ids]
+        return rows[:, :4], scores, class_ids
+
+    def predict(self, frame, confidence, overlap=DEFAULT_OVERLAP):
+        letterbox = self.letterboxes.get()
+        letterbox.apply(frame)
+        output = self.session.run(None, {self.input_name: letterbox.to_blob()})[0]
+        boxes, scores, class_ids = self._decode(output)
+        mask = scores >= confidence
+        boxes, scores, class_ids = boxes[mask], scores[mask], class_ids[mask]
+        if not len(scores):
+            return empty_records()
+        corners = np.empty_like(boxes)
+        corners[:, :2] = boxes[:, :2] - boxes[:, 2:] / 2
+        corners[:, 2:] = boxes[:, :2] + boxes[:, 2:] / 2
+        offsets = class_ids[:, np.newaxis] * (max(self.input_width, self.input_height) + 1)
+        keep = non_max_suppression(corners + offsets, scores, overlap)
+        return letterbox.invert(records_from_arrays(boxes[keep, :2], boxes[keep, 2:], scores[keep], class_ids[keep]))
+
+    def close(self):
+        self.session = None
+
+def tile_regions(width, height, columns, rows, overlap):
+    tile_width = int(round(width / (columns - (columns - 1) * overlap)))
+    tile_height = int(round(height / (rows - (rows - 1) * overlap)))
+    xs = np.linspace(0, width - tile_width, columns).round().astype(int) if columns > 1 else [0]
+    ys = np.linspace(0, height - tile_height, rows).round().astype(int) if rows > 1 else [0]
+    return [(int(x), int(y), tile_width, tile_height) for y in ys for x in xs]
+
+def merge_records(records, overlap):
+    if len(records) < 2:
+        return records
+    boxes = record_corners(records)
+    offsets = records['class_id'][:, np.newaxis].astype(np.float32) * (boxes.max() - boxes.min() + 1)
+    return records[non_max_suppression(boxes + offsets, records['confidence'], overlap)]
+
+class TiledBackend(DetectionBackend):
+    def __init__(self, backend, grid=DEFAULT_TILE_GRID, overlap=DEFAULT_TILE_OVERLAP):
+        self.backend = backend
+        self.name = f"{backend.name} ({grid[0]}x{grid[1]} tiles)"
+        self.concurrent = backend.concurrent
+        self.class_table = backend.class_table
+        self.columns, self.rows = grid
+        self.overlap = overlap
+        tile_count = self.columns * self.rows
+        self._executor = ThreadPoolExecutor(max_workers=tile_count, thread_name_prefix="tile") if backend.concurrent else None
+        self._calls = 0
+        self._tile_time = np.zeros(tile_count)
+
+    def _predict_tile(self, frame, region, confidence, overlap):
+        x, y, width, height = region
+        started = time.perf_counter()
+        records = self.backend.predict(frame[y:y + height, x:x + width], confidence, overlap)
+        records['x'] += x
+        records['y'] += y
+        return records, time.perf_counter() - started
+
+    def predict(self, frame, confidence, overlap=DEFAULT_OVERLAP):
+        regions = tile_regions(frame.shape[1], frame.shape[0], self.columns, self.rows, self.overlap)
+        if self._executor is not None:
+            tiles = list(self._executor.map(lambda region: self._predict_tile(frame, region, confidence, overlap), regions))
+        else:
+            tiles = [self._predict_tile(frame, region, confidence, overlap) for region in regions]
+        timings = np.array([elapsed for _, elapsed in tiles])
+        self._record(timings)
+        merged = merge_records(np.concatenate([records for records, _ in tiles]), overlap)
+        LOGGER.debug(f"Tiled inference: {len(merged)} prediction(s), tile times {', '.join(f'{elapsed * 1000:.0f}' for elapsed in timings)} ms")
+        return merged
+
+    def _record(self, timings):
+        self._calls += 1
+        self._tile_time += timings
+        if self._calls % TILE_STATS_LOG_INTERVAL == 0:
+            LOGGER.info(f"Tiled inference stats: {self.stats()}")
+
+    def stats(self):
+        count = max(self._calls, 1)
+        return {'calls': self._calls, 'avg_tile_ms': [round(float(total) / count * 1000, 1) for total in self._tile_time]}
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._calls:
+            LOGGER.info(f"Tiled inference stats: {self.stats()}")
+
+def default_warmup_runs(backend):
+    return DEFAULT_WARMUP_RUNS if backend == BACKEND_ONNX else HOSTED_WARMUP_RUNS
+
+def warm_up(backend, width, height, runs=DEFAULT_WARMUP_RUNS):
+    frame = np.full((height, width, 3), LETTERBOX_FILL, dtype=np.uint8)
+    timings = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        backend.predict(frame, 1.0)
+        timings.append(time.perf_counter() - started)
+    stats = {
+        'cold_ms': round(timings[0] * 1000, 1),
+        'warm_ms': round(float(np.median(timings[1:])) * 1000, 1) if len(timings) > 1 else None
+    }
+    LOGGER.info(f"Backend {backend.name} warmed up: {stats}")
+    return stats
+
+def create_detection_backend(model_config):
+    backend = model_config.get('backend', BACKEND_ROBOFLOW)
+    if backend == BACKEND_ONNX:
+        return OnnxBackend(
+            model_config['path'],
+            model_config.get('classes', []),
+            model_config.get('input_size', DEFAULT_ONNX_INPUT_SIZE),
+            model_config.get('threads', 0),
+            model_config.get('optimized_path'),
+            model_config.get('save_optimized', False)
+        )
+    if backend in (BACKEND_ROBOFLOW, BACKEND_MOCK):
+        if model_config.get('client') is None:
+            raise ValueError(f"No hosted {backend} model configured")
+        return RoboflowBackend(model_config['client'], model_config.get('classes', []), model_config.get('input_size', DEFAULT_HOSTED_INPUT_SIZE))
+    raise ValueError(f"Unknown detection backend: {backend}")
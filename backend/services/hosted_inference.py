@@ -0,0 +1,116 @@
+import base64
+import logging
+import threading
+import time
+import cv2
+import requests
+from requests.adapters import HTTPAdapter
+
+LOGGER = logging.getLogger("roboflow")
+
+HOSTED_API_URL = "https://detect.roboflow.com"
+DEFAULT_JPEG_QUALITY = 80
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 15.0
+POOL_SIZE = 4
+STATS_LOG_INTERVAL = 100
+
+class HostedInferenceClient:
+    def __init__(self, api_key, dataset, version, api_url=HOSTED_API_URL, jpeg_quality=DEFAULT_JPEG_QUALITY):
+        self.url = f"{api_url.rstrip('/')}/{dataset}/{version}"
+        self.jpeg_quality = jpeg_quality
+        self._api_key = api_key
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._reset_stats()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        del state['_lock']
+        del state['_sessions']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions = []
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.requests = 0
+        self.bytes_sent = 0
+        self.server_time = 0.0
+        self.network_time = 0.0
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def encode(self, frame):
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("Failed to JPEG-encode frame")
+        return base64.b64encode(buffer)
+
+    def predict(self, frame, confidence, overlap):
+        payload = self.encode(frame)
+        params = {
+            'api_key': self._api_key,
+            'confidence': int(round(confidence * 100)),
+            'overlap': int(round(overlap * 100)),
+            'format': "json"
+        }
+        started = time.perf_counter()
+        response = self._session().post(
+            self.url,
+            params=params,
+            data=payload,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        result = response.json()
+        server_time = float(result.get('time') or 0.0)
+        network_time = max(elapsed - server_time, 0.0)
+        self._record(len(payload), server_time, network_time)
+        LOGGER.debug(f"Hosted inference: {len(payload)} bytes sent, server {server_time * 1000:.0f} ms, network {network_time * 1000:.0f} ms")
+        return result
+
+    def _record(self, bytes_sent, server_time, network_time):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += bytes_sent
+            self.server_time += server_time
+            self.network_time += network_time
+            if self.requests % STATS_LOG_INTERVAL == 0:
+                LOGGER.info(f"Hosted inference stats: {self.stats()}")
+
+    def stats(self):
+        count = max(self.requests, 1)
+        return {
+            'requests': self.requests,
+            'avg_bytes_sent': self.bytes_sent // count,
+            'avg_server_ms': round(self.server_time / count * 1000, 1),
+            'avg_network_ms': round(self.network_time / count * 1000, 1)
+        }
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+        if self.requests:
+            LOGGER.info(f"Hosted inference stats: {self.stats()}")
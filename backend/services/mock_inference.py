@@ -0,0 +1,214 @@
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from pathlib import Path
+import argparse
+import base64
+import json
+import logging
+import math
+import random
+import threading
+import time
+import numpy as np
+import cv2
+from backend.services.detection_backends import read_setting
+
+LOGGER = logging.getLogger("roboflow")
+
+MOCK_HOST = "127.0.0.1"
+MOCK_DATASET = "mock"
+MOCK_VERSION = 1
+MOCK_API_KEY = "mock"
+DEFAULT_MOCK_PORT = 0
+DEFAULT_MOCK_LATENCY = 0.12
+DEFAULT_MOCK_JITTER = 0.03
+DEFAULT_MOCK_BOXES = 4
+DEFAULT_TIMEOUT_DELAY = 20.0
+DISTRIBUTION_FIXED = "fixed"
+DISTRIBUTION_UNIFORM = "uniform"
+DISTRIBUTION_NORMAL = "normal"
+DISTRIBUTION_LOGNORMAL = "lognormal"
+LATENCY_DISTRIBUTIONS = [DISTRIBUTION_FIXED, DISTRIBUTION_UNIFORM, DISTRIBUTION_NORMAL, DISTRIBUTION_LOGNORMAL]
+SYNTHETIC_SPEED = 0.05
+
+def get_mock_settings(settings_manager):
+    section = settings_manager.get_setting("mock") or {}
+    distribution = section.get("distribution") or DISTRIBUTION_NORMAL
+    if distribution not in LATENCY_DISTRIBUTIONS:
+        LOGGER.warning(f"Unknown mock latency distribution '{distribution}', using {DISTRIBUTION_NORMAL}")
+        distribution = DISTRIBUTION_NORMAL
+    def setting(key, parse, default):
+        return read_setting(section, key, parse, default, "mock", LOGGER)
+    return {
+        'port': setting("port", int, DEFAULT_MOCK_PORT),
+        'latency': setting("latency", float, DEFAULT_MOCK_LATENCY),
+        'jitter': setting("jitter", float, DEFAULT_MOCK_JITTER),
+        'error_rate': setting("error_rate", float, 0.0),
+        'timeout_rate': setting("timeout_rate", float, 0.0),
+        'timeout_delay': setting("timeout_delay", float, DEFAULT_TIMEOUT_DELAY),
+        'boxes': setting("boxes", int, DEFAULT_MOCK_BOXES),
+        'seed': setting("seed", int, None),
+        'distribution': distribution,
+        'predictions': section.get("predictions", "")
+    }
+
+class MockInferenceServer:
+    def __init__(self, classes, settings):
+        self.classes = list(classes) or ["object"]
+        self.settings = dict(settings)
+        self._random = random.Random(self.settings.get('seed'))
+        self._random_lock = threading.Lock()
+        self._canned = self._load_canned(self.settings.get('predictions'))
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self._httpd = None
+        self._thread = None
+
+    def _load_canned(self, path):
+        if not path:
+            return None
+        data = json.loads(Path(path).read_text())
+        return data.get('predictions', []) if isinstance(data, dict) else data
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                server._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((MOCK_HOST, self.settings.get('port', DEFAULT_MOCK_PORT)), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-inference", daemon=True)
+        self._thread.start()
+        LOGGER.info(f"Mock inference server listening on {self.url} ({self.settings})")
+        return self
+
+    def _sample(self, low=0.0, high=1.0):
+        with self._random_lock:
+            return self._random.uniform(low, high)
+
+    def _latency(self):
+        latency = self.settings.get('latency', DEFAULT_MOCK_LATENCY)
+        jitter = self.settings.get('jitter', DEFAULT_MOCK_JITTER)
+        distribution = self.settings.get('distribution', DISTRIBUTION_NORMAL)
+        with self._random_lock:
+            if distribution == DISTRIBUTION_UNIFORM:
+                sample = self._random.uniform(latency - jitter, latency + jitter)
+            elif distribution == DISTRIBUTION_NORMAL:
+                sample = self._random.gauss(latency, jitter)
+            elif distribution == DISTRIBUTION_LOGNORMAL and latency > 0:
+                sigma = math.sqrt(math.log(1 + (jitter / latency) ** 2))
+                sample = self._random.lognormvariate(math.log(latency) - sigma ** 2 / 2, sigma)
+            else:
+                sample = latency
+        return max(sample, 0.0)
+
+    def _synthetic(self, width, height, confidence):
+        now = time.time()
+        predictions = []
+        for index in range(self.settings.get('boxes', DEFAULT_MOCK_BOXES)):
+            phase = now * SYNTHETIC_SPEED + index / max(self.settings.get('boxes', 1), 1)
+            score = 0.5 + 0.45 * abs(math.sin(now + index))
+            if score < confidence:
+                continue
+            predictions.append({
+                'x': width * (0.1 + 0.8 * (phase % 1.0)),
+                'y': height * (0.25 + 0.5 * ((index * 0.37) % 1.0)),
+                'width': width / 8,
+                'height': height / 4,
+                'confidence': round(score, 3),
+                'class': self.classes[index % len(self.classes)]
+            })
+        return predictions
+
+    def _respond(self, handler, status, body):
+        payload = json.dumps(body).encode()
+        try:
+            handler.send_response(status)
+            handler.send_header("Content-Type", "application/json")
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _handle(self, handler):
+        started = time.perf_counter()
+        body = handler.rfile.read(int(handler.headers.get("Content-Length", 0)))
+        params = parse_qs(urlparse(handler.path).query)
+        confidence = float(params.get("confidence", ["40"])[0]) / 100
+        with self._stats_lock:
+            self.requests += 1
+        roll = self._sample()
+        if roll < self.settings.get('timeout_rate', 0.0):
+            with self._stats_lock:
+                self.timeouts += 1
+            time.sleep(self.settings.get('timeout_delay', DEFAULT_TIMEOUT_DELAY))
+            return self._respond(handler, 504, {'error': "Injected timeout"})
+        time.sleep(self._latency())
+        if roll < self.settings.get('timeout_rate', 0.0) + self.settings.get('error_rate', 0.0):
+            with self._stats_lock:
+                self.errors += 1
+            return self._respond(handler, 500, {'error': "Injected error"})
+        image = cv2.imdecode(np.frombuffer(base64.b64decode(body), np.uint8), cv2.IMREAD_COLOR) if body else None
+        height, width = image.shape[:2] if image is not None else (0, 0)
+        if self._canned is not None:
+            predictions = [dict(pred) for pred in self._canned if pred.get('confidence', 1.0) >= confidence]
+        else:
+            predictions = self._synthetic(width, height, confidence)
+        self._respond(handler, 200, {
+            'time': time.perf_counter() - started,
+            'image': {'width': width, 'height': height},
+            'predictions': predictions
+        })
+
+    def stats(self):
+        with self._stats_lock:
+            return {'requests': self.requests, 'errors': self.errors, 'timeouts': self.timeouts}
+
+    def stop(self):
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=1)
+        self._httpd = None
+        self._thread = None
+        LOGGER.info(f"Mock inference server stopped: {self.stats()}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the hosted inference API")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--classes", default="student,cheating")
+    parser.add_argument("--latency", type=float, default=DEFAULT_MOCK_LATENCY)
+    parser.add_argument("--jitter", type=float, default=DEFAULT_MOCK_JITTER)
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default=DISTRIBUTION_NORMAL)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-delay", type=float, default=DEFAULT_TIMEOUT_DELAY)
+    parser.add_argument("--boxes", type=int, default=DEFAULT_MOCK_BOXES)
+    parser.add_argument("--predictions", default="")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    settings = {key: value for key, value in vars(args).items() if key != "classes"}
+    server = MockInferenceServer([name.strip() for name in args.classes.split(",") if name.strip()], settings).start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from pathlib import Path
+import hashlib
+import json
+import logging
+import re
+from config.settings_manager import CONFIG_DIR
+
+LOGGER = logging.getLogger("roboflow")
+
+MODEL_CACHE_DIR = CONFIG_DIR / "model_cache"
+METADATA_SUFFIX = ".json"
+OPTIMIZED_SUFFIX = ".ort.onnx"
+
+def _safe_name(key):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", key)
+
+def load_model_metadata(key):
+    path = MODEL_CACHE_DIR / f"{_safe_name(key)}{METADATA_SUFFIX}"
+    if not path.is_file():
+        return None
+    try:
+        metadata = json.loads(path.read_text())
+    except (OSError, ValueError) as e:
+        LOGGER.warning(f"Ignoring unreadable model cache entry {path.name}: {e}")
+        return None
+    LOGGER.info(f"Loaded cached model metadata: {path.name}")
+    return metadata
+
+def save_model_metadata(key, metadata):
+    try:
+        MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = MODEL_CACHE_DIR / f"{_safe_name(key)}{METADATA_SUFFIX}"
+        path.write_text(json.dumps(metadata, indent=2))
+    except OSError as e:
+        LOGGER.warning(f"Could not write model cache entry for {key}: {e}")
+
+def discard_model_metadata(key):
+    path = MODEL_CACHE_DIR / f"{_safe_name(key)}{METADATA_SUFFIX}"
+    if path.is_file():
+        path.unlink()
+        LOGGER.info(f"Discarded cached model metadata: {path.name}")
+
+def optimized_model_path(model_path):
+    model_path = Path(model_path)
+    stat = model_path.stat()
+    digest = hashlib.sha1(f"{model_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return MODEL_CACHE_DIR / f"{_safe_name(model_path.stem)}-{digest}{OPTIMIZED_SUFFIX}"
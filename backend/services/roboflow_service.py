@@ -3,6 +3,12 @@ import sys
 from roboflow import Roboflow
 from backend.utils.log_config import _logger_stream_handler
 from backend.services import database_service
+from backend.services.detection_backends import BACKEND_ONNX, BACKEND_ROBOFLOW, BACKEND_MOCK, get_model_settings, onnxruntime_available, create_detection_backend, warm_up
+from backend.services.mock_inference import MockInferenceServer, get_mock_settings, MOCK_API_KEY, MOCK_DATASET, MOCK_VERSION
+from backend.services.hosted_inference import HostedInferenceClient, HOSTED_API_URL
+from backend.services.model_cache import load_model_metadata, save_model_metadata, discard_model_metadata, optimized_model_path
+import config.settings_manager as settings_manager
+from pathlib import Path
 
 LOGGER = logging.getLogger("roboflow")
 
@@ -36,7 +42,12 @@ class RoboflowManager:
 
     def __init__(self):
         self._model = None
+        self._client = None
+        self._mock_server = None
+        self._model_config = None
         self._classes = []
+        self._cache_key = None
+        self.warmup_stats = None
         self.logger = LOGGER
         self.logger.setLevel(logging.INFO)
 
@@ -44,6 +55,14 @@ class RoboflowManager:
     def model(self):
         return self._model
 
+    @property
+    def client(self):
+        return self._client
+
+    @property
+    def model_config(self):
+        return self._model_config
+
     @property
     def classes(self):
         return self._classes
@@ -79,21 +98,119 @@ class RoboflowManager:
         if not model_classes:
             return self._handle_error("No model classes specified")
 
-        self.logger.info(f"Connecting to Roboflow (Project: {project_name}, Version: {model_version})")
-        try:
-            rf = Roboflow(api_key=api_key)
-            project = rf.workspace().project(project_name)
-            self._model = project.version(model_version).model
-            self._classes = [cls.strip() for cls in model_classes.split(",") if cls.strip()]
+        model_settings = get_model_settings(settings_manager)
+        if model_settings['backend'] != BACKEND_MOCK:
+            self._stop_mock_server()
+        if model_settings['backend'] == BACKEND_ONNX:
+            return self._initialize_local_model(model_settings, model_classes)
+        if model_settings['backend'] == BACKEND_MOCK:
+            return self._initialize_mock_model(model_settings, model_classes)
 
+        self._cache_key = f"roboflow-{project_name}-{model_version}"
+        try:
+            self._classes = self._parse_classes(model_classes)
             if not self._classes:
                 return self._handle_error("No valid classes found after parsing model_classes")
 
+            metadata = load_model_metadata(self._cache_key)
+            if metadata:
+                self.logger.info(f"Using cached Roboflow endpoint for {project_name} v{model_version}")
+                self._model = None
+            else:
+                self.logger.info(f"Connecting to Roboflow (Project: {project_name}, Version: {model_version})")
+                rf = Roboflow(api_key=api_key)
+                project = rf.workspace().project(project_name)
+                self._model = project.version(model_version).model
+                metadata = {'dataset': self._model.id.rsplit("/")[1], 'version': self._model.version, 'api_url': HOSTED_API_URL}
+                save_model_metadata(self._cache_key, metadata)
+
+            if self._client:
+                self._client.close()
+            self._client = HostedInferenceClient(
+                api_key, metadata['dataset'], metadata['version'],
+                api_url=metadata.get('api_url', HOSTED_API_URL), jpeg_quality=model_settings['jpeg_quality']
+            )
+            self._model_config = {'backend': BACKEND_ROBOFLOW, 'client': self._client, 'jpeg_quality': model_settings['jpeg_quality'], 'input_size': model_settings['input_size'], 'classes': self._classes}
+            self.logger.info(f"Hosted inference endpoint: {self._client.url} (JPEG quality {self._client.jpeg_quality}, input {model_settings['input_size'][0]}x{model_settings['input_size'][1]})")
+
             self.logger.info(f"Model initialized with classes: {', '.join(self._classes)}")
             return True
         except Exception as e:
+            discard_model_metadata(self._cache_key)
             return self._handle_error(f"Failed to initialize Roboflow: {str(e)}")
 
+    def _parse_classes(self, model_classes):
+        return [cls.strip() for cls in model_classes.split(",") if cls.strip()]
+
+    def _initialize_local_model(self, model_settings, model_classes):
+        model_path = Path(model_settings['path'])
+        if not model_settings['path'] or not model_path.is_file():
+            return self._handle_error(f"ONNX model file not found: {model_settings['path'] or '(not set)'}")
+        if not onnxruntime_available():
+            return self._handle_error("onnxruntime is not installed, cannot use the local ONNX backend")
+
+        self._classes = self._parse_classes(model_classes)
+        if not self._classes:
+            return self._handle_error("No valid classes found after parsing model_classes")
+
+        self._model = None
+        self._cache_key = None
+        try:
+            optimized_path = str(optimized_model_path(model_path))
+        except OSError as e:
+            self.logger.warning(f"Optimized model cache unavailable: {e}")
+            optimized_path = None
+        self._model_config = {
+            'backend': BACKEND_ONNX,
+            'path': str(model_path),
+            'optimized_path': optimized_path,
+            'input_size': model_settings['input_size'],
+            'classes': self._classes
+        }
+        self.logger.info(f"Using local ONNX model {model_path.name} with classes: {', '.join(self._classes)}")
+        return True
+
+    def _stop_mock_server(self):
+        if self._mock_server:
+            self._mock_server.stop()
+            self._mock_server = None
+
+    def _initialize_mock_model(self, model_settings, model_classes):
+        self._classes = self._parse_classes(model_classes)
+        if not self._classes:
+            return self._handle_error("No valid classes found after parsing model_classes")
+        self._stop_mock_server()
+        try:
+            self._mock_server = MockInferenceServer(self._classes, get_mock_settings(settings_manager)).start()
+        except (OSError, ValueError) as e:
+            self._mock_server = None
+            return self._handle_error(f"Failed to start mock inference server: {str(e)}")
+
+        if self._client:
+            self._client.close()
+        self._model = None
+        self._cache_key = None
+        self._client = HostedInferenceClient(MOCK_API_KEY, MOCK_DATASET, MOCK_VERSION, api_url=self._mock_server.url, jpeg_quality=model_settings['jpeg_quality'])
+        self._model_config = {'backend': BACKEND_MOCK, 'client': self._client, 'jpeg_quality': model_settings['jpeg_quality'], 'input_size': model_settings['input_size'], 'classes': self._classes}
+        self.logger.info(f"Using mock inference server at {self._client.url} with classes: {', '.join(self._classes)}")
+        return True
+
+    def invalidate_cache(self):
+        if self._cache_key:
+            discard_model_metadata(self._cache_key)
+        if self._model_config and self._model_config.get('optimized_path'):
+            Path(self._model_config['optimized_path']).unlink(missing_ok=True)
+
+    def warm_up_model(self, width, height):
+        if not self._model_config or self._model_config['backend'] != BACKEND_ONNX:
+            return None
+        backend = create_detection_backend(dict(self._model_config, save_optimized=True))
+        try:
+            self.warmup_stats = warm_up(backend, width, height)
+        finally:
+            backend.close()
+        return self.warmup_stats
+
     def initialize(self, splash_screen=None):
         original_stdout = sys.stdout
         custom_stdout = self._set_stdout(splash_screen)
@@ -2,7 +2,10 @@ from .check_config import check_config
 from .check_internet import check_internet
 from .check_roboflow import check_roboflow
 from .check_dbc import check_database
+from .check_warmup import check_warmup
 from PyQt6.QtCore import QTimer
+import config.settings_manager as settings_manager
+from backend.services.detection_backends import BACKEND_ROBOFLOW, BACKEND_ONNX, get_model_settings
 
 def run_checks(log_display, on_complete):
     def after_config(config_ok):
@@ -14,10 +17,16 @@ def run_checks(log_display, on_complete):
             check_internet(log_display, after_internet)
 
     def after_internet(internet_ok):
-        if internet_ok:
+        if internet_ok or get_model_settings(settings_manager)['backend'] != BACKEND_ROBOFLOW:
             check_roboflow(log_display, after_roboflow)
 
     def after_roboflow(roboflow_ok):
+        if roboflow_ok and get_model_settings(settings_manager)['backend'] == BACKEND_ONNX:
+            check_warmup(log_display, lambda _: after_warmup(roboflow_ok))
+        else:
+            after_warmup(roboflow_ok)
+
+    def after_warmup(roboflow_ok):
         log_display.log("All checks complete, logging in...", "info")
         QTimer.singleShot(500, lambda: on_complete(roboflow_ok))
 
@@ -0,0 +1,19 @@
+from PyQt6.QtCore import QTimer
+from backend.services.application_state import ApplicationState
+from backend.utils.mp_utils import CAM_WIDTH, CAM_HEIGHT
+
+def check_warmup(log_display, on_complete):
+    rf = ApplicationState.get_instance().roboflow
+    log_display.log("Warming up detection model...")
+    def try_warmup():
+        try:
+            stats = rf.warm_up_model(CAM_WIDTH, CAM_HEIGHT)
+        except Exception as e:
+            log_display.log(f"Model warm-up failed: {str(e)}", "warning")
+            rf.invalidate_cache()
+        else:
+            if stats:
+                warm = f"{stats['warm_ms']} ms" if stats['warm_ms'] is not None else "n/a"
+                log_display.log(f"Model ready (first inference {stats['cold_ms']} ms, warm {warm})", "success")
+        QTimer.singleShot(100, lambda: on_complete(True))
+    QTimer.singleShot(100, try_warmup)
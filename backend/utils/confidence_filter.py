@@ -0,0 +1,31 @@
+import logging
+
+detection_logger = logging.getLogger("detection")
+
+DEFAULT_CONFIDENCE_FLOOR = 0.1
+
+def get_class_thresholds(settings_manager):
+    thresholds = {}
+    for name, value in (settings_manager.get_setting("thresholds") or {}).items():
+        try:
+            thresholds[name] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            detection_logger.warning(f"Invalid confidence threshold for class '{name}': {value}")
+    return thresholds
+
+class ConfidenceFilter:
+    def __init__(self, default=0.0, class_thresholds=None):
+        self.default = default
+        self.set_class_thresholds(class_thresholds or {})
+
+    def set_class_thresholds(self, class_thresholds):
+        self._class_thresholds = {name.lower(): value for name, value in class_thresholds.items()}
+
+    def threshold_for(self, class_name):
+        return self._class_thresholds.get(str(class_name).lower(), self.default)
+
+    def passes(self, detection):
+        return detection.get('confidence', 0.0) >= self.threshold_for(detection['class'])
+
+    def apply(self, detections):
+        return [detection for detection in detections if self.passes(detection)]
@@ -1,73 +1,128 @@
+import heapq
+import itertools
 import time
 import logging
+import threading
+import numpy as np
 
 DEADZONE_SIZE = 100
 DEADZONE_DURATION = 300
 
+def suppress_duplicates(centers, scores, radius=DEADZONE_SIZE // 2, sizes=None, iou_threshold=None):
+    order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)[order]
+    if iou_threshold is None:
+        xs, ys = centers[:, 0], centers[:, 1]
+        overlaps = (np.abs(np.subtract.outer(xs, xs)) <= radius) & (np.abs(np.subtract.outer(ys, ys)) <= radius)
+    else:
+        half = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)[order] / 2
+        corners = np.hstack((centers - half, centers + half))
+        areas = (corners[:, 2] - corners[:, 0]) * (corners[:, 3] - corners[:, 1])
+        inter_w = np.clip(np.minimum(corners[:, None, 2], corners[None, :, 2]) - np.maximum(corners[:, None, 0], corners[None, :, 0]), 0, None)
+        inter_h = np.clip(np.minimum(corners[:, None, 3], corners[None, :, 3]) - np.maximum(corners[:, None, 1], corners[None, :, 1]), 0, None)
+        inter = inter_w * inter_h
+        overlaps = inter / (areas[:, None] + areas[None, :] - inter + 1e-9) > iou_threshold
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for index in range(len(order)):
+        if not suppressed[index]:
+            keep.append(index)
+            suppressed |= overlaps[index]
+    return order[keep]
+
+class DeadzoneGrid:
+    def __init__(self, cell_size=DEADZONE_SIZE, duration=DEADZONE_DURATION, radius=DEADZONE_SIZE // 2):
+        self.cell_size = cell_size
+        self.duration = duration
+        self.radius = radius
+        self._cells = {}
+        self._expiry = []
+        self._order = itertools.count()
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _cell(self, value):
+        return int(value // self.cell_size)
+
+    def add(self, x, y, class_name, timestamp):
+        key = (class_name, self._cell(x), self._cell(y))
+        zone = (x, y, timestamp + self.duration)
+        self._cells.setdefault(key, []).append(zone)
+        heapq.heappush(self._expiry, (zone[2], next(self._order), key, zone))
+        self._count += 1
+
+    def expire(self, now):
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, _, key, zone = heapq.heappop(self._expiry)
+            cell = self._cells.get(key)
+            if cell is None:
+                continue
+            cell.remove(zone)
+            if not cell:
+                del self._cells[key]
+            removed += 1
+        self._count -= removed
+        return removed
+
+    def contains(self, x, y, class_name, now=None):
+        for cell_x in range(self._cell(x - self.radius), self._cell(x + self.radius) + 1):
+            for cell_y in range(self._cell(y - self.radius), self._cell(y + self.radius) + 1):
+                for zone_x, zone_y, expires in self._cells.get((class_name, cell_x, cell_y), ()):
+                    if abs(x - zone_x) <= self.radius and abs(y - zone_y) <= self.radius and (now is None or expires > now):
+                        return True
+        return False
+
+    def clear(self):
+        self._cells = {}
+        self._expiry = []
+        self._count = 0
+
 class DetectionDeduplicator:
-    _deadzones = []
+    def __init__(self, iou_threshold=None, camera_id=None):
+        self.iou_threshold = iou_threshold
+        self.camera_id = camera_id
+        self.logger = logging.getLogger('detection')
+        self._deadzones = DeadzoneGrid()
+        self._lock = threading.Lock()
 
-    @staticmethod
-    def deduplicate(predictions, capture_class):
-        logger = logging.getLogger('detection')
+    def __len__(self):
+        with self._lock:
+            return len(self._deadzones)
+
+    def deduplicate(self, predictions, capture_class):
         now = time.time()
-        before = len(DetectionDeduplicator._deadzones)
-        DetectionDeduplicator._deadzones = [
-            dz for dz in DetectionDeduplicator._deadzones if now - dz['timestamp'] < DEADZONE_DURATION
-        ]
-        after = len(DetectionDeduplicator._deadzones)
-        if before > after:
-            logger.info(f"Deadzone removed, total now: {after}")
-        filtered = []
-        for det in predictions:
-            if det['class'] == capture_class:
-                if DetectionDeduplicator._in_deadzone(det):
-                    continue
-                filtered.append(det)
-            else:
-                filtered.append(det)
-        filtered = DetectionDeduplicator._dedup_same_class(filtered, capture_class)
-        return filtered
-
-    @staticmethod
-    def _in_deadzone(det):
-        for dz in DetectionDeduplicator._deadzones:
-            if det['class'] == dz['class']:
-                if (
-                    abs(det['x'] - dz['x']) <= DEADZONE_SIZE // 2 and
-                    abs(det['y'] - dz['y']) <= DEADZONE_SIZE // 2
-                ):
-                    return True
-        return False
+        with self._lock:
+            if self._deadzones.expire(now):
+                self.logger.info(f"Deadzone removed (camera {self.camera_id}), total now: {len(self._deadzones)}")
+            filtered = [
+                det for det in predictions
+                if det['class'] != capture_class or not self._deadzones.contains(det['x'], det['y'], det['class'], now)
+            ]
+        return self._dedup_same_class(filtered, capture_class)
+
+    def in_deadzone(self, det):
+        with self._lock:
+            return self._deadzones.contains(det['x'], det['y'], det['class'], time.time())
+
+    def add_deadzone(self, det, timestamp):
+        with self._lock:
+            self._deadzones.add(det['x'], det['y'], det['class'], timestamp)
+        self.logger.info(f"Deadzone created (camera {self.camera_id}) at x={det['x']}, y={det['y']}, class={det['class']}")
+
+    def clear(self):
+        with self._lock:
+            self._deadzones.clear()
 
-    @staticmethod
-    def _add_deadzone(det, timestamp):
-        logger = logging.getLogger('detection')
-        DetectionDeduplicator._deadzones.append({
-            'x': det['x'],
-            'y': det['y'],
-            'class': det['class'],
-            'timestamp': timestamp
-        })
-        logger.info(f"Deadzone created at x={det['x']}, y={det['y']}, class={det['class']}")
-
-    @staticmethod
-    def _dedup_same_class(predictions, capture_class):
-        result = []
-        seen = []
-        for det in sorted(predictions, key=lambda d: -d.get('confidence', 0)):
-            if det['class'] == capture_class:
-                duplicate = False
-                for s in seen:
-                    if (
-                        abs(det['x'] - s['x']) <= DEADZONE_SIZE // 2 and
-                        abs(det['y'] - s['y']) <= DEADZONE_SIZE // 2
-                    ):
-                        duplicate = True
-                        break
-                if not duplicate:
-                    seen.append(det)
-                    result.append(det)
-            else:
-                result.append(det)
-        return result
+    def _dedup_same_class(self, predictions, capture_class):
+        ordered = sorted(predictions, key=lambda d: -d.get('confidence', 0))
+        candidates = [index for index, det in enumerate(ordered) if det['class'] == capture_class]
+        if len(candidates) < 2:
+            return ordered
+        centers = [(ordered[index]['x'], ordered[index]['y']) for index in candidates]
+        sizes = [(ordered[index].get('width', 0.0), ordered[index].get('height', 0.0)) for index in candidates] if self.iou_threshold is not None else None
+        kept = suppress_duplicates(centers, -np.arange(len(candidates)), sizes=sizes, iou_threshold=self.iou_threshold)
+        dropped = set(candidates) - {candidates[index] for index in kept.tolist()}
+        return [det for index, det in enumerate(ordered) if index not in dropped]
@@ -0,0 +1,86 @@
+import numpy as np
+
+DETECTION_DTYPE = np.dtype([
+    ('x', np.float32),
+    ('y', np.float32),
+    ('width', np.float32),
+    ('height', np.float32),
+    ('confidence', np.float32),
+    ('class_id', np.int16),
+    ('frame_seq', np.int64)
+])
+
+class ClassTable:
+    def __init__(self, names=()):
+        self._names = []
+        self._ids = {}
+        for name in names:
+            self.id_for(name)
+
+    @property
+    def names(self):
+        return tuple(self._names)
+
+    def id_for(self, name):
+        name = str(name)
+        class_id = self._ids.get(name)
+        if class_id is None:
+            class_id = len(self._names)
+            self._names.append(name)
+            self._ids[name] = class_id
+        return class_id
+
+    def name_for(self, class_id):
+        return self._names[class_id] if 0 <= class_id < len(self._names) else str(class_id)
+
+def empty_records(count=0):
+    return np.zeros(count, dtype=DETECTION_DTYPE)
+
+def records_from_arrays(centers, sizes, scores, class_ids):
+    records = empty_records(len(scores))
+    records['x'], records['y'] = centers[:, 0], centers[:, 1]
+    records['width'], records['height'] = sizes[:, 0], sizes[:, 1]
+    records['confidence'] = scores
+    records['class_id'] = class_ids
+    return records
+
+def records_from_predictions(predictions, class_table):
+    return np.array(
+        [(pred['x'], pred['y'], pred.get('width', 0.0), pred.get('height', 0.0), pred.get('confidence', 0.0), class_table.id_for(pred['class']), 0) for pred in predictions],
+        dtype=DETECTION_DTYPE
+    )
+
+def records_to_predictions(records, class_names):
+    return [
+        {
+            'x': float(x),
+            'y': float(y),
+            'width': float(width),
+            'height': float(height),
+            'confidence': float(confidence),
+            'class': class_names[class_id] if 0 <= class_id < len(class_names) else str(class_id),
+            'class_id': int(class_id)
+        }
+        for x, y, width, height, confidence, class_id in zip(
+            records['x'].tolist(), records['y'].tolist(), records['width'].tolist(),
+            records['height'].tolist(), records['confidence'].tolist(), records['class_id'].tolist()
+        )
+    ]
+
+def scale_records(records, scale_x, scale_y, offset_x=0.0, offset_y=0.0):
+    records['x'] = records['x'] * scale_x + offset_x
+    records['y'] = records['y'] * scale_y + offset_y
+    records['width'] *= scale_x
+    records['height'] *= scale_y
+    return records
+
+def record_corners(records):
+    half_width = records['width'] / 2
+    half_height = records['height'] / 2
+    return np.stack((records['x'] - half_width, records['y'] - half_height, records['x'] + half_width, records['y'] + half_height), axis=1)
+
+def encode_records(records):
+    return np.ascontiguousarray(records, dtype=DETECTION_DTYPE).tobytes()
+
+def decode_records(payload):
+    return np.frombuffer(payload, dtype=DETECTION_DTYPE)
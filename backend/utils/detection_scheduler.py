@@ -0,0 +1,266 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import namedtuple
+from queue import Empty
+import logging
+import time
+from backend.utils.frame_buffer import FrameSubscriber
+
+detection_logger = logging.getLogger("detection")
+
+FEED_ADD = "add"
+FEED_REMOVE = "remove"
+
+EWMA_ALPHA = 0.2
+DEFAULT_TARGET_FPS = 5.0
+DEFAULT_MAX_AGE = 1.0
+MAX_DETECTION_INTERVAL = 5.0
+BACKOFF_FACTOR = 1.25
+RECOVERY_FACTOR = 0.9
+
+CLAIM_SEQ = 0
+CLAIM_TIME = 1
+CLAIM_INFERRED = 2
+CLAIM_REFRESHED = 3
+CLAIM_FIELDS = 4
+CLAIM_GRANTED = "granted"
+CLAIM_BUSY = "busy"
+CLAIM_STATIC = "static"
+
+HEALTH_HEARTBEAT = 0
+HEALTH_COMPLETED = 1
+HEALTH_ERRORS = 2
+HEALTH_RATE = 3
+HEALTH_FIELDS = 4
+
+InferenceResult = namedtuple("InferenceResult", ["camera_id", "seq", "timestamp", "predictions", "error", "latency"])
+
+class FeedScheduler:
+    def __init__(self, feed_updates):
+        self._feed_updates = feed_updates
+        self._subscribers = {}
+        self._order = []
+        self._cursor = 0
+
+    @property
+    def camera_ids(self):
+        return list(self._order)
+
+    def add(self, camera_id, subscriber_spec):
+        self.remove(camera_id)
+        try:
+            self._subscribers[camera_id] = FrameSubscriber.attach(subscriber_spec)
+        except FileNotFoundError:
+            detection_logger.warning(f"Frame ring for camera {camera_id} is gone, skipping feed")
+            return
+        self._order.append(camera_id)
+        detection_logger.info(f"Detection scheduler added camera {camera_id} ({len(self._order)} feed(s))")
+
+    def remove(self, camera_id):
+        subscriber = self._subscribers.pop(camera_id, None)
+        if subscriber is None:
+            return
+        self._order.remove(camera_id)
+        self._cursor = 0
+        subscriber.close()
+        detection_logger.info(f"Detection scheduler removed camera {camera_id} ({len(self._order)} feed(s))")
+
+    def apply_updates(self):
+        while True:
+            try:
+                update = self._feed_updates.get_nowait()
+            except Empty:
+                return
+            if update[0] == FEED_ADD:
+                self.add(update[1], update[2])
+            elif update[0] == FEED_REMOVE:
+                self.remove(update[1])
+
+    def next_delivery(self):
+        count = len(self._order)
+        for offset in range(count):
+            position = (self._cursor + offset) % count
+            camera_id = self._order[position]
+            delivery = self._subscribers[camera_id].poll()
+            if delivery is not None:
+                self._cursor = (position + 1) % count
+                return camera_id, delivery
+        return None
+
+    def snapshot(self, camera_id, delivery):
+        return self._subscribers[camera_id].snapshot(delivery)
+
+    def close(self):
+        for camera_id in list(self._order):
+            self.remove(camera_id)
+
+class InferencePipeline:
+    def __init__(self, backend, max_in_flight=1):
+        self.backend = backend
+        self.max_in_flight = max(1, max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="predict") if self.max_in_flight > 1 else None
+        self._pending = {}
+        self._finished = []
+        self._latest_seq = {}
+        self.discarded = 0
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    @property
+    def full(self):
+        return len(self._pending) >= self.max_in_flight
+
+    def submit(self, camera_id, delivery, confidence):
+        submitted = time.perf_counter()
+        if self._executor is None:
+            try:
+                predictions = self.backend.predict(delivery.frame, confidence)
+                result = InferenceResult(camera_id, delivery.seq, delivery.timestamp, predictions, None, time.perf_counter() - submitted)
+            except Exception as e:
+                result = InferenceResult(camera_id, delivery.seq, delivery.timestamp, None, e, time.perf_counter() - submitted)
+            self._finished.append(result)
+            return
+        future = self._executor.submit(self.backend.predict, delivery.frame, confidence)
+        self._pending[future] = (camera_id, delivery.seq, delivery.timestamp, submitted)
+
+    def wait(self, timeout):
+        if self._pending:
+            wait(list(self._pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+    def completed(self):
+        for future in [future for future in self._pending if future.done()]:
+            camera_id, seq, timestamp, submitted = self._pending.pop(future)
+            error = future.exception()
+            self._finished.append(InferenceResult(camera_id, seq, timestamp, None if error else future.result(), error, time.perf_counter() - submitted))
+        finished, self._finished = sorted(self._finished, key=lambda result: result.seq), []
+        results = []
+        for result in finished:
+            if result.error is None:
+                if result.seq <= self._latest_seq.get(result.camera_id, 0):
+                    self.discarded += 1
+                    detection_logger.debug(f"Discarded stale result for camera {result.camera_id} frame {result.seq}")
+                    continue
+                self._latest_seq[result.camera_id] = result.seq
+            results.append(result)
+        return results
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.discarded:
+            detection_logger.info(f"Inference pipeline discarded {self.discarded} stale result(s)")
+        self._pending = {}
+        self._finished = []
+
+class AdaptiveFrameSkip:
+    def __init__(self, target_fps=DEFAULT_TARGET_FPS, max_age=DEFAULT_MAX_AGE, max_in_flight=1):
+        self.min_interval = 1.0 / max(target_fps, 0.1)
+        self.max_age = max_age
+        self.max_in_flight = max(1, max_in_flight)
+        self.interval = self.min_interval
+        self.latency = None
+        self.age = None
+        self._completed = 0
+        self._window_start = time.time()
+        self.detection_fps = 0.0
+
+    def _ewma(self, current, sample):
+        return sample if current is None else current + EWMA_ALPHA * (sample - current)
+
+    def _floor(self, camera_count):
+        if self.latency is None:
+            return self.min_interval
+        return max(self.min_interval, self.latency * max(camera_count, 1) / self.max_in_flight)
+
+    def observe(self, latency, age, camera_count):
+        self.latency = self._ewma(self.latency, latency)
+        self.age = self._ewma(self.age, age)
+        self._completed += 1
+        floor = self._floor(camera_count)
+        if self.age > self.max_age:
+            self.interval = min(self.interval * BACKOFF_FACTOR, MAX_DETECTION_INTERVAL)
+        else:
+            self.interval = self.interval * RECOVERY_FACTOR
+        self.interval = min(max(self.interval, floor), MAX_DETECTION_INTERVAL)
+
+    def served(self):
+        self._completed += 1
+
+    def update_rate(self, now):
+        elapsed = now - self._window_start
+        if elapsed < 1.0:
+            return None
+        self.detection_fps = self._completed / elapsed
+        self._completed = 0
+        self._window_start = now
+        detection_logger.debug(
+            f"Detection rate {self.detection_fps:.1f} fps, interval {self.interval * 1000:.0f} ms, "
+            f"latency {(self.latency or 0) * 1000:.0f} ms, age {(self.age or 0) * 1000:.0f} ms"
+        )
+        return self.detection_fps
+
+class FrameClaims:
+    def __init__(self, shared):
+        self._shared = shared
+
+    def claim(self, camera_id, seq, now, interval, change_seq=None, refresh=0.0):
+        base = camera_id * CLAIM_FIELDS
+        with self._shared.get_lock():
+            previous = int(self._shared[base + CLAIM_SEQ])
+            if seq <= previous or now - self._shared[base + CLAIM_TIME] < interval:
+                return CLAIM_BUSY, 0
+            self._shared[base + CLAIM_SEQ] = seq
+            self._shared[base + CLAIM_TIME] = now
+            skipped = seq - previous - 1 if previous else 0
+            if change_seq is not None and change_seq <= self._shared[base + CLAIM_INFERRED] and now - self._shared[base + CLAIM_REFRESHED] < refresh:
+                return CLAIM_STATIC, skipped
+            self._shared[base + CLAIM_INFERRED] = seq
+            self._shared[base + CLAIM_REFRESHED] = now
+            return CLAIM_GRANTED, skipped
+
+    def inferred(self, camera_id):
+        with self._shared.get_lock():
+            return int(self._shared[camera_id * CLAIM_FIELDS + CLAIM_INFERRED])
+
+    def forget(self, camera_id):
+        with self._shared.get_lock():
+            self._shared[camera_id * CLAIM_FIELDS + CLAIM_INFERRED] = 0.0
+
+    def reset(self, camera_id=None):
+        with self._shared.get_lock():
+            if camera_id is None:
+                self._shared[:] = [0.0] * len(self._shared)
+            else:
+                base = camera_id * CLAIM_FIELDS
+                self._shared[base:base + CLAIM_FIELDS] = [0.0] * CLAIM_FIELDS
+
+class WorkerHealth:
+    def __init__(self, shared, index):
+        self._row = index * HEALTH_FIELDS
+        self._shared = shared
+
+    def beat(self, now):
+        self._shared[self._row + HEALTH_HEARTBEAT] = now
+
+    def completed(self):
+        self._shared[self._row + HEALTH_COMPLETED] += 1
+
+    def failed(self):
+        self._shared[self._row + HEALTH_ERRORS] += 1
+
+    def set_rate(self, rate):
+        self._shared[self._row + HEALTH_RATE] = rate
+
+    def reset(self):
+        self._shared[self._row:self._row + HEALTH_FIELDS] = [0.0] * HEALTH_FIELDS
+
+    def snapshot(self, now):
+        heartbeat = self._shared[self._row + HEALTH_HEARTBEAT]
+        return {
+            'heartbeat_age': now - heartbeat if heartbeat else None,
+            'completed': int(self._shared[self._row + HEALTH_COMPLETED]),
+            'errors': int(self._shared[self._row + HEALTH_ERRORS]),
+            'rate': self._shared[self._row + HEALTH_RATE]
+        }
@@ -0,0 +1,246 @@
+from multiprocessing import shared_memory
+from collections import namedtuple
+import logging
+import time
+import numpy as np
+import cv2
+
+camera_logger = logging.getLogger("camera")
+
+RING_SLOTS = 8
+MAX_SUBSCRIBERS = 16
+CONTROL_ALIGN = 64
+
+STAT_DELIVERED = 0
+STAT_DROPPED = 1
+STAT_LAST_SEQ = 2
+STAT_MODE = 3
+SUBSCRIBER_FIELDS = 4
+
+RATE_GRAB = 0
+RATE_PUBLISH = 1
+RATE_FIELDS = 2
+
+POLICY_LATEST = "latest"
+POLICY_EVERY = "every"
+POLICY_MODES = {POLICY_LATEST: 1, POLICY_EVERY: 2}
+
+FrameRingSpec = namedtuple("FrameRingSpec", ["name", "slots", "height", "width"])
+SubscriberSpec = namedtuple("SubscriberSpec", ["ring", "index", "name", "policy"])
+FrameDelivery = namedtuple("FrameDelivery", ["seq", "timestamp", "frame", "skipped", "change_seq"])
+
+def _control_length(slots):
+    return 1 + slots * 2 + MAX_SUBSCRIBERS * SUBSCRIBER_FIELDS
+
+def _control_size(slots):
+    size = _control_length(slots) * np.dtype(np.int64).itemsize + (slots + RATE_FIELDS) * np.dtype(np.float64).itemsize
+    return ((size + CONTROL_ALIGN - 1) // CONTROL_ALIGN) * CONTROL_ALIGN
+
+class SharedFrameRing:
+    def __init__(self, shm, spec, owner=False):
+        self._shm = shm
+        self._owner = owner
+        self.spec = spec
+        self._control = np.ndarray((_control_length(spec.slots),), dtype=np.int64, buffer=shm.buf)
+        self._slot_seq = self._control[1:1 + spec.slots]
+        self._slot_change = self._control[1 + spec.slots:1 + spec.slots * 2]
+        self._stats = self._control[1 + spec.slots * 2:].reshape(MAX_SUBSCRIBERS, SUBSCRIBER_FIELDS)
+        self._floats = np.ndarray(
+            (spec.slots + RATE_FIELDS,),
+            dtype=np.float64,
+            buffer=shm.buf,
+            offset=self._control.nbytes
+        )
+        self._slot_time = self._floats[:spec.slots]
+        self._rates = self._floats[spec.slots:]
+        self._frames = np.ndarray(
+            (spec.slots, spec.height, spec.width, 3),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=_control_size(spec.slots)
+        )
+        self._change_seq = 0
+
+    @classmethod
+    def create(cls, width, height, slots=RING_SLOTS):
+        size = _control_size(slots) + slots * height * width * 3
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        ring = cls(shm, FrameRingSpec(shm.name, slots, height, width), owner=True)
+        ring._control[:] = 0
+        ring._floats[:] = 0
+        camera_logger.info(f"Frame ring created: {shm.name} ({slots} slots, {width}x{height})")
+        return ring
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(shared_memory.SharedMemory(name=spec.name), spec)
+
+    @property
+    def latest_seq(self):
+        return int(self._control[0])
+
+    def publish(self, frame, timestamp=None, changed=True):
+        seq = int(self._control[0]) + 1
+        if changed:
+            self._change_seq = seq
+        slot = seq % self.spec.slots
+        self._slot_seq[slot] = 0
+        target = self._frames[slot]
+        if frame.shape == target.shape:
+            np.copyto(target, frame)
+        else:
+            cv2.resize(frame, (self.spec.width, self.spec.height), dst=target)
+        self._slot_time[slot] = timestamp if timestamp is not None else time.time()
+        self._slot_change[slot] = self._change_seq
+        self._slot_seq[slot] = seq
+        self._control[0] = seq
+        return seq
+
+    def read(self, seq):
+        slot = seq % self.spec.slots
+        if seq <= 0 or int(self._slot_seq[slot]) != seq:
+            return None
+        return self._frames[slot]
+
+    def timestamp(self, seq):
+        return float(self._slot_time[seq % self.spec.slots])
+
+    def change_seq(self, seq):
+        return int(self._slot_change[seq % self.spec.slots])
+
+    def is_valid(self, seq):
+        return int(self._slot_seq[seq % self.spec.slots]) == seq
+
+    def record_delivery(self, index, seq, dropped):
+        self._stats[index, STAT_DELIVERED] += 1
+        self._stats[index, STAT_DROPPED] += dropped
+        self._stats[index, STAT_LAST_SEQ] = seq
+
+    def subscriber_stats(self, index):
+        return {'delivered': int(self._stats[index, STAT_DELIVERED]), 'dropped': int(self._stats[index, STAT_DROPPED])}
+
+    def activate_subscriber(self, index, policy):
+        self._stats[index] = 0
+        self._stats[index, STAT_LAST_SEQ] = self.latest_seq
+        self._stats[index, STAT_MODE] = POLICY_MODES[policy]
+
+    def deactivate_subscriber(self, index):
+        self._stats[index, STAT_MODE] = 0
+
+    def has_demand(self):
+        modes = self._stats[:, STAT_MODE]
+        if (modes == POLICY_MODES[POLICY_EVERY]).any():
+            return True
+        waiting = self._stats[:, STAT_LAST_SEQ] >= int(self._control[0])
+        return bool((waiting & (modes == POLICY_MODES[POLICY_LATEST])).any())
+
+    def set_rates(self, grab_fps, publish_fps):
+        self._rates[RATE_GRAB] = grab_fps
+        self._rates[RATE_PUBLISH] = publish_fps
+
+    def rates(self):
+        return {'grab_fps': float(self._rates[RATE_GRAB]), 'publish_fps': float(self._rates[RATE_PUBLISH])}
+
+    def close(self):
+        self._control = None
+        self._slot_seq = None
+        self._slot_change = None
+        self._stats = None
+        self._floats = None
+        self._slot_time = None
+        self._rates = None
+        self._frames = None
+        try:
+            self._shm.close()
+        except BufferError:
+            camera_logger.debug(f"Frame ring {self.spec.name} still has live views, deferring unmap")
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+class FrameSubscriber:
+    def __init__(self, ring, spec, owns_ring=False):
+        self.ring = ring
+        self.spec = spec
+        self._owns_ring = owns_ring
+        self.last_seq = ring.latest_seq
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(SharedFrameRing.attach(spec.ring), spec, owns_ring=True)
+
+    def poll(self):
+        latest = self.ring.latest_seq
+        if latest <= self.last_seq:
+            return None
+        if self.spec.policy == POLICY_EVERY:
+            seq = max(self.last_seq + 1, latest - self.ring.spec.slots + 2)
+        else:
+            seq = latest
+        frame = self.ring.read(seq)
+        if frame is None:
+            return None
+        timestamp = self.ring.timestamp(seq)
+        change_seq = self.ring.change_seq(seq)
+        skipped = seq - self.last_seq - 1
+        self.ring.record_delivery(self.spec.index, seq, skipped)
+        self.last_seq = seq
+        return FrameDelivery(seq, timestamp, frame, skipped, change_seq)
+
+    def snapshot(self, delivery):
+        frame = delivery.frame.copy()
+        if not self.ring.is_valid(delivery.seq):
+            camera_logger.debug(f"Frame {delivery.seq} was overwritten while copying, dropping it")
+            return None
+        return delivery._replace(frame=frame)
+
+    def stats(self):
+        return self.ring.subscriber_stats(self.spec.index)
+
+    def close(self):
+        if self._owns_ring:
+            self.ring.close()
+
+class FrameDistributor:
+    def __init__(self, width, height, slots=RING_SLOTS):
+        self.ring = SharedFrameRing.create(width, height, slots)
+        self._subscribers = {}
+
+    @property
+    def latest_seq(self):
+        return self.ring.latest_seq
+
+    def subscribe(self, name, policy=POLICY_LATEST):
+        if name in self._subscribers:
+            return self._subscribers[name]
+        used = {spec.index for spec in self._subscribers.values()}
+        free = [index for index in range(MAX_SUBSCRIBERS) if index not in used]
+        if not free:
+            raise RuntimeError(f"No free frame subscriber slots for '{name}'")
+        self.ring.activate_subscriber(free[0], policy)
+        spec = SubscriberSpec(self.ring.spec, free[0], name, policy)
+        self._subscribers[name] = spec
+        camera_logger.info(f"Frame subscriber '{name}' registered (slot {free[0]}, policy: {policy})")
+        return spec
+
+    def open(self, spec):
+        return FrameSubscriber(self.ring, spec)
+
+    def unsubscribe(self, name):
+        spec = self._subscribers.pop(name, None)
+        if spec is not None:
+            self.ring.deactivate_subscriber(spec.index)
+            camera_logger.info(f"Frame subscriber '{name}' removed: {self.ring.subscriber_stats(spec.index)}")
+
+    def stats(self):
+        return {name: self.ring.subscriber_stats(spec.index) for name, spec in self._subscribers.items()}
+
+    def rates(self):
+        return self.ring.rates()
+
+    def close(self):
+        for name in list(self._subscribers):
+            self.unsubscribe(name)
+        self.ring.close()
@@ -0,0 +1,257 @@
+from pathlib import Path
+import glob
+import logging
+import re
+import sys
+import numpy as np
+import cv2
+
+camera_logger = logging.getLogger("camera")
+
+SOURCE_DSHOW = "dshow"
+SOURCE_V4L2 = "v4l2"
+SOURCE_ANY = "any"
+SOURCE_VIDEO = "video"
+SOURCE_IMAGES = "images"
+SOURCE_SYNTHETIC = "synthetic"
+
+SOURCE_TYPES = [SOURCE_DSHOW, SOURCE_V4L2, SOURCE_ANY, SOURCE_VIDEO, SOURCE_IMAGES, SOURCE_SYNTHETIC]
+FILE_SOURCE_TYPES = [SOURCE_VIDEO, SOURCE_IMAGES]
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+MAX_PROBED_DEVICES = 8
+
+def default_source_type():
+    return SOURCE_DSHOW if sys.platform == "win32" else SOURCE_V4L2
+
+def get_source_config(settings_manager):
+    section = settings_manager.get_setting("camera") or {}
+    source_type = section.get("source") or default_source_type()
+    if source_type not in SOURCE_TYPES:
+        camera_logger.warning(f"Unknown camera source '{source_type}', falling back to {default_source_type()}")
+        source_type = default_source_type()
+    return {'type': source_type, 'path': section.get("path", "")}
+
+class FrameSource:
+    native_rate = False
+
+    def __init__(self, width, height, fps):
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    def open(self):
+        raise NotImplementedError
+
+    def is_open(self):
+        raise NotImplementedError
+
+    def grab(self):
+        raise NotImplementedError
+
+    def retrieve(self):
+        raise NotImplementedError
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+class DeviceSource(FrameSource):
+    api_preference = cv2.CAP_ANY
+    native_rate = True
+
+    def __init__(self, width, height, fps, device_index=0):
+        super().__init__(width, height, fps)
+        self.device_index = device_index
+        self._cap = None
+
+    def open(self):
+        self._cap = cv2.VideoCapture(self.device_index, self.api_preference)
+        self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self._cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        device_fps = self._cap.get(cv2.CAP_PROP_FPS)
+        if device_fps and device_fps > 0:
+            self.fps = device_fps
+        return self._cap.isOpened()
+
+    def is_open(self):
+        return self._cap is not None and self._cap.isOpened()
+
+    def grab(self):
+        return self._cap.grab()
+
+    def retrieve(self):
+        return self._cap.retrieve()
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+class DirectShowSource(DeviceSource):
+    api_preference = cv2.CAP_DSHOW
+
+class V4L2Source(DeviceSource):
+    api_preference = cv2.CAP_V4L2
+
+class VideoFileSource(FrameSource):
+    def __init__(self, width, height, fps, path):
+        super().__init__(width, height, fps)
+        self.path = path
+        self._cap = None
+
+    def open(self):
+        self._cap = cv2.VideoCapture(self.path)
+        file_fps = self._cap.get(cv2.CAP_PROP_FPS)
+        if file_fps and file_fps > 0:
+            self.fps = file_fps
+        return self._cap.isOpened()
+
+    def is_open(self):
+        return self._cap is not None and self._cap.isOpened()
+
+    def grab(self):
+        if self._cap.grab():
+            return True
+        self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self._cap.grab()
+
+    def retrieve(self):
+        return self._cap.retrieve()
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+class ImageFolderSource(FrameSource):
+    def __init__(self, width, height, fps, path):
+        super().__init__(width, height, fps)
+        self.path = Path(path)
+        self._files = []
+        self._index = 0
+        self._current = None
+
+    def open(self):
+        if self.path.is_dir():
+            self._files = sorted(f for f in self.path.iterdir() if f.suffix.lower() in IMAGE_EXTENSIONS)
+        return bool(self._files)
+
+    def is_open(self):
+        return bool(self._files)
+
+    def grab(self):
+        self._current = self._files[self._index]
+        self._index = (self._index + 1) % len(self._files)
+        return True
+
+    def retrieve(self):
+        frame = cv2.imread(str(self._current))
+        return frame is not None, frame
+
+    def release(self):
+        self._files = []
+
+class SyntheticSource(FrameSource):
+    BOX_COUNT = 3
+    BOX_SIZE = 120
+
+    def __init__(self, width, height, fps, seed=0):
+        super().__init__(width, height, fps)
+        self._rng = np.random.default_rng(seed)
+        self._frame = np.empty((height, width, 3), dtype=np.uint8)
+        self._positions = None
+        self._velocities = None
+        self._frame_index = 0
+
+    def open(self):
+        limits = np.array([self.width - self.BOX_SIZE, self.height - self.BOX_SIZE], dtype=np.float64)
+        self._positions = self._rng.uniform(0, 1, (self.BOX_COUNT, 2)) * limits
+        self._velocities = self._rng.uniform(-6, 6, (self.BOX_COUNT, 2))
+        self._frame_index = 0
+        return True
+
+    def is_open(self):
+        return self._positions is not None
+
+    def grab(self):
+        limits = np.array([self.width - self.BOX_SIZE, self.height - self.BOX_SIZE], dtype=np.float64)
+        self._positions += self._velocities
+        bounced = (self._positions < 0) | (self._positions > limits)
+        self._velocities[bounced] *= -1
+        np.clip(self._positions, 0, limits, out=self._positions)
+        self._frame_index += 1
+        return True
+
+    def retrieve(self):
+        self._frame[:] = 48
+        for index, (x, y) in enumerate(self._positions.astype(int)):
+            color = (60 + 60 * index, 200 - 50 * index, 220)
+            cv2.rectangle(self._frame, (x, y), (x + self.BOX_SIZE, y + self.BOX_SIZE), color, -1)
+        cv2.putText(self._frame, f"synthetic #{self._frame_index}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        return True, self._frame
+
+    def release(self):
+        self._positions = None
+
+def create_frame_source(source_config, device_index, width, height, fps):
+    source_type = source_config.get('type') or default_source_type()
+    path = source_config.get('path', "")
+    if source_type == SOURCE_DSHOW:
+        return DirectShowSource(width, height, fps, device_index)
+    if source_type == SOURCE_V4L2:
+        return V4L2Source(width, height, fps, device_index)
+    if source_type == SOURCE_ANY:
+        return DeviceSource(width, height, fps, device_index)
+    if source_type == SOURCE_VIDEO:
+        return VideoFileSource(width, height, fps, path)
+    if source_type == SOURCE_IMAGES:
+        return ImageFolderSource(width, height, fps, path)
+    if source_type == SOURCE_SYNTHETIC:
+        return SyntheticSource(width, height, fps)
+    raise ValueError(f"Unknown camera source type: {source_type}")
+
+def _list_dshow_devices():
+    from pygrabber.dshow_graph import FilterGraph
+    return FilterGraph().get_input_devices()
+
+def _list_v4l2_devices():
+    devices = sorted(glob.glob("/dev/video*"), key=lambda d: int(d.replace("/dev/video", "") or 0))
+    return [f"{d} (index {d.replace('/dev/video', '')})" for d in devices]
+
+def _probe_devices(api_preference):
+    devices = []
+    for index in range(MAX_PROBED_DEVICES):
+        cap = cv2.VideoCapture(index, api_preference)
+        if cap.isOpened():
+            devices.append(f"Camera {index}")
+        cap.release()
+    return devices
+
+def list_source_devices(source_config):
+    source_type = source_config.get('type') or default_source_type()
+    if source_type == SOURCE_DSHOW:
+        return _list_dshow_devices()
+    if source_type == SOURCE_V4L2:
+        if sys.platform.startswith("linux"):
+            return _list_v4l2_devices()
+        return _probe_devices(cv2.CAP_V4L2)
+    if source_type == SOURCE_ANY:
+        return _probe_devices(cv2.CAP_ANY)
+    if source_type in FILE_SOURCE_TYPES:
+        path = source_config.get('path', "")
+        return [Path(path).name or path] if path and Path(path).exists() else []
+    if source_type == SOURCE_SYNTHETIC:
+        return ["Synthetic feed"]
+    return []
+
+def device_index_for(source_config, device_name, devices):
+    if source_config.get('type') in (SOURCE_V4L2, SOURCE_ANY):
+        match = re.search(r"(\d+)\)?$", device_name)
+        if match:
+            return int(match.group(1))
+    return devices.index(device_name)
@@ -7,7 +7,7 @@ from frontend.themes.boxcolors import get_box_palette
 camera_logger = logging.getLogger('camera')
 report_logger = logging.getLogger('report')
 
-def display_frame(frame, display_label, window):
+def display_frame(frame, display_label, window, camera_id=0):
     if frame is None:
         return
     try:
@@ -16,7 +16,7 @@ def display_frame(frame, display_label, window):
         return
     try:
         selected_filter = window.detection_controls.filter_combo.currentText()
-        for detection in window.detection_manager.detections:
+        for detection in window.detection_manager.detections_for(camera_id):
             if selected_filter == "All" or detection['class'] == selected_filter:
                 draw_bounding_box(image_rgb, detection, window)
         update_canvas(image_rgb, display_label)
@@ -39,6 +39,8 @@ def draw_bounding_box(image, detection, window):
         box_color, text_color = get_box_palette(color_index, theme)
         cv2.rectangle(image, (x0, y0), (x1, y1), box_color, 1)
         label_text = class_name if window.detection_controls.display_mode_combo.currentText() == "Draw Labels" else f"{(confidence * 100):.0f}%"
+        if 'track_id' in detection:
+            label_text = f"{label_text} #{detection['track_id']}"
         put_text(image, label_text, x0, y0, box_color, text_color)
     except Exception as e:
         report_logger.error(f"Error drawing bounding box: {e}")
@@ -5,7 +5,11 @@ import logging
 from PIL import Image, ImageDraw, ImageFont
 import time
 import os
-from backend.utils.deduplication_utils import DetectionDeduplicator
+
+CAPTURE_ROOT = "tempcaptures"
+
+def capture_dir(camera_id):
+    return os.path.join(CAPTURE_ROOT, f"camera-{camera_id + 1}")
 
 class ImageCaptureManager:
     logger = logging.getLogger('report')
@@ -40,11 +44,12 @@ class ImageCaptureManager:
         return pil_image
     
     @staticmethod
-    def capture_image(detection, current_image, window):
+    def capture_image(detection, current_image, window, camera_id=0):
         if detection['class'] != window.get_selected_capture_class():
             return
             
-        if DetectionDeduplicator._in_deadzone(detection):
+        deduplicator = window.detection_manager.deduplicator_for(camera_id)
+        if deduplicator.in_deadzone(detection):
             ImageCaptureManager.logger.info(f"Skipped capture: detection in deadzone {detection}")
             return
         
@@ -66,7 +71,9 @@ class ImageCaptureManager:
         pil_image = ImageCaptureManager._add_watermark(pil_image)
         
         random_id = ''.join(random.choices(string.ascii_lowercase + string.digits, k=5))
-        image_filename = f"tempcaptures/untagged({random_id}).jpg"
+        directory = capture_dir(camera_id)
+        os.makedirs(directory, exist_ok=True)
+        image_filename = os.path.join(directory, f"untagged({random_id}).jpg")
         pil_image.save(image_filename, quality=100, subsampling=0)
         
-        DetectionDeduplicator._add_deadzone(detection, time.time())
+        deduplicator.add_deadzone(detection, time.time())
@@ -8,10 +8,11 @@ class TempCaptureCleaner:
     def cleanup():
         if not os.path.exists("tempcaptures"):
             return
-        for filename in os.listdir("tempcaptures"):
-            if filename.endswith(".jpg"):
-                file_path = os.path.join("tempcaptures", filename)
-                try:
-                    os.remove(file_path)
-                except Exception as e:
-                    TempCaptureCleaner.logger.error(f"Error deleting file {file_path}: {e}")
+        for directory, _, filenames in os.walk("tempcaptures"):
+            for filename in filenames:
+                if filename.endswith(".jpg"):
+                    file_path = os.path.join(directory, filename)
+                    try:
+                        os.remove(file_path)
+                    except Exception as e:
+                        TempCaptureCleaner.logger.error(f"Error deleting file {file_path}: {e}")
@@ -0,0 +1,70 @@
+import threading
+import numpy as np
+import cv2
+from backend.utils.detection_records import scale_records
+
+LETTERBOX_FILL = 114
+
+def parse_input_size(value):
+    parts = [int(part) for part in str(value).lower().split("x")]
+    if len(parts) == 1:
+        parts = parts * 2
+    width, height = parts
+    if width < 32 or height < 32:
+        raise ValueError(f"Input size too small: {value}")
+    return width, height
+
+class Letterbox:
+    def __init__(self, width, height, fill=LETTERBOX_FILL):
+        self.width = width
+        self.height = height
+        self.fill = fill
+        self.canvas = np.full((height, width, 3), fill, dtype=np.uint8)
+        self.planes = np.empty((3, height, width), dtype=np.uint8)
+        self.blob = np.empty((1, 3, height, width), dtype=np.float32)
+        self.scale = 1.0
+        self.pad_x = 0
+        self.pad_y = 0
+        self._source_size = None
+        self._resized_size = None
+        self._window = None
+
+    def _fit(self, source_width, source_height):
+        if self._source_size == (source_width, source_height):
+            return
+        self.scale = min(self.width / source_width, self.height / source_height)
+        resized_width = min(self.width, max(1, int(round(source_width * self.scale))))
+        resized_height = min(self.height, max(1, int(round(source_height * self.scale))))
+        self.pad_x = (self.width - resized_width) // 2
+        self.pad_y = (self.height - resized_height) // 2
+        self.canvas[:] = self.fill
+        self._window = self.canvas[self.pad_y:self.pad_y + resized_height, self.pad_x:self.pad_x + resized_width]
+        self._resized_size = (resized_width, resized_height)
+        self._source_size = (source_width, source_height)
+
+    def apply(self, frame):
+        self._fit(frame.shape[1], frame.shape[0])
+        cv2.resize(frame, self._resized_size, dst=self._window, interpolation=cv2.INTER_LINEAR)
+        return self.canvas
+
+    def to_blob(self):
+        for channel in range(3):
+            cv2.extractChannel(self.canvas, 2 - channel, self.planes[channel])
+        np.multiply(self.planes, np.float32(1.0 / 255.0), out=self.blob[0], casting='unsafe')
+        return self.blob
+
+    def invert(self, records):
+        inverse = 1.0 / self.scale
+        return scale_records(records, inverse, inverse, -self.pad_x * inverse, -self.pad_y * inverse)
+
+class LetterboxPool:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._local = threading.local()
+
+    def get(self):
+        letterbox = getattr(self._local, "letterbox", None)
+        if letterbox is None:
+            letterbox = self._local.letterbox = Letterbox(self.width, self.height)
+        return letterbox
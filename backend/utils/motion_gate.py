@@ -0,0 +1,50 @@
+import logging
+import cv2
+
+camera_logger = logging.getLogger("camera")
+
+MOTION_WIDTH = 160
+MOTION_HEIGHT = 90
+MOTION_PIXEL_THRESHOLD = 25
+DEFAULT_MOTION_AREA = 0.002
+DEFAULT_REFRESH_INTERVAL = 10.0
+
+def _as_bool(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+def get_motion_config(settings_manager):
+    section = settings_manager.get_setting("camera") or {}
+    try:
+        area = float(section.get("motion_area", DEFAULT_MOTION_AREA))
+        refresh_interval = float(section.get("motion_refresh", DEFAULT_REFRESH_INTERVAL))
+    except ValueError:
+        camera_logger.warning("Invalid motion gate settings, using defaults")
+        area, refresh_interval = DEFAULT_MOTION_AREA, DEFAULT_REFRESH_INTERVAL
+    return {
+        'enabled': _as_bool(section.get("motion_gate", False)),
+        'area': area,
+        'refresh_interval': refresh_interval
+    }
+
+class MotionGate:
+    def __init__(self, area=DEFAULT_MOTION_AREA):
+        self.area = area
+        self._reference = None
+        self._changed_pixels = 0
+
+    @property
+    def changed_fraction(self):
+        return self._changed_pixels / float(MOTION_WIDTH * MOTION_HEIGHT)
+
+    def check(self, frame):
+        small = cv2.resize(frame, (MOTION_WIDTH, MOTION_HEIGHT), interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0)
+        if self._reference is None:
+            self._reference = gray
+            return True
+        diff = cv2.absdiff(gray, self._reference)
+        self._changed_pixels = cv2.countNonZero(cv2.threshold(diff, MOTION_PIXEL_THRESHOLD, 255, cv2.THRESH_BINARY)[1])
+        if self.changed_fraction < self.area:
+            return False
+        self._reference = gray
+        return True
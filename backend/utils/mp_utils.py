@@ -2,10 +2,23 @@ from multiprocessing import get_context
 from multiprocessing.synchronize import Event as EventType
 from multiprocessing.queues import Queue as QueueType
 from multiprocessing.sharedctypes import Value as ValueType
+from multiprocessing.connection import Connection
 from queue import Empty, Full
-from typing import Dict, Any
-import cv2
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from backend.utils.frame_buffer import SharedFrameRing, FrameRingSpec
+from backend.utils.detection_scheduler import (
+    FeedScheduler, InferencePipeline, AdaptiveFrameSkip, FrameClaims, WorkerHealth,
+    FEED_ADD, FEED_REMOVE, CLAIM_FIELDS, CLAIM_GRANTED, CLAIM_STATIC, HEALTH_FIELDS, DEFAULT_TARGET_FPS, DEFAULT_MAX_AGE
+)
+from backend.utils.frame_sources import FrameSource, create_frame_source
+from backend.utils.motion_gate import MotionGate, DEFAULT_REFRESH_INTERVAL
+from backend.utils.prediction_cache import PredictionCache, create_cache_storage, frame_hash, DEFAULT_HASH_THRESHOLD, DEFAULT_CACHE_TTL
+from backend.utils.detection_records import encode_records
+from backend.utils.confidence_filter import DEFAULT_CONFIDENCE_FLOOR
+from backend.services.detection_backends import DetectionBackend, TiledBackend, create_detection_backend, warm_up, default_warmup_runs, DEFAULT_TILE_GRID, DEFAULT_TILE_OVERLAP, BACKEND_ROBOFLOW
 import logging
+import os
+import threading
 import time
 
 camera_logger = logging.getLogger("camera")
@@ -14,118 +27,530 @@ detection_logger = logging.getLogger("detection")
 CAM_WIDTH = 1280
 CAM_HEIGHT = 720
 CAM_FRAMES = 30.0
+FRAME_POLL_INTERVAL = 0.005
+RATE_WINDOW = 1.0
+WORKER_READY_TIMEOUT = 30.0
+WORKER_REPLY_TIMEOUT = 5.0
+WORKER_CONFIGURE_TIMEOUT = 60.0
+WORKER_LIVENESS_INTERVAL = 0.1
+MAILBOX_FLUSH_TIMEOUT = 0.05
 
-def start_camera_process(frame_queue: QueueType, stop_event: EventType, device_index: int):
-    ctx = get_context('spawn')
-    process = ctx.Process(target=_camera_process_entry, args=(frame_queue, stop_event, device_index))
-    process.daemon = True
-    return process
-
-def start_detection_process(frame_queue: QueueType, result_queue: QueueType, stop_event: EventType, model_config: Dict[str, Any], confidence_value: ValueType, connection_state: ValueType):
-    ctx = get_context('spawn')
-    process = ctx.Process(target=_detection_process_entry, args=(frame_queue, result_queue, stop_event, model_config, confidence_value, connection_state))
-    process.daemon = True
-    return process
-
-def _camera_process_entry(frame_queue: QueueType, stop_event: EventType, device_index: int):
-    _camera_loop(frame_queue, stop_event, device_index)
-
-def _detection_process_entry(frame_queue: QueueType, result_queue: QueueType, stop_event: EventType, model_config: Dict[str, Any], confidence_value: ValueType, connection_state: ValueType):
-    _detection_loop(frame_queue, result_queue, stop_event, model_config, confidence_value, connection_state)
-
-def _camera_loop(frame_queue: QueueType, stop_event: EventType, device_index: int):
-    frame_interval = 1.0 / CAM_FRAMES
-    cap = cv2.VideoCapture(device_index + cv2.CAP_DSHOW)
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAM_WIDTH)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAM_HEIGHT)
-    last_frame_time = 0
-    
-    while not stop_event.is_set() and cap.isOpened():
-        current_time = time.time()
-        time_since_last_frame = current_time - last_frame_time
-        
-        if time_since_last_frame < frame_interval:
-            time.sleep(frame_interval - time_since_last_frame)
-            continue
-            
-        ret, frame = cap.read()
-        if not ret:
+CMD_START = "start"
+CMD_STOP = "stop"
+CMD_RECONFIGURE = "reconfigure"
+CMD_SHUTDOWN = "shutdown"
+
+WORKER_READY = "ready"
+WORKER_STARTED = "started"
+WORKER_STOPPED = "stopped"
+WORKER_CONFIGURED = "configured"
+WORKER_ERROR = "error"
+
+class ResultMailbox:
+    def __init__(self):
+        self._queue = get_context('spawn').Queue(maxsize=1)
+
+    def post(self, item):
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except Full:
+                try:
+                    current = self._queue.get(timeout=MAILBOX_FLUSH_TIMEOUT)
+                except Empty:
+                    continue
+                if current['seq'] > item['seq']:
+                    item, current = current, item
+                item['skipped'] += current['skipped'] + 1
+
+    def take(self):
+        try:
+            if self._queue.full():
+                return self._queue.get(timeout=MAILBOX_FLUSH_TIMEOUT)
+            return self._queue.get_nowait()
+        except Empty:
+            return None
+
+    def clear(self):
+        while self.take() is not None:
+            pass
+
+class WarmWorker:
+    def __init__(self, name: str, target: Callable, args: Tuple, logger: logging.Logger):
+        ctx = get_context('spawn')
+        self.name = name
+        self.logger = logger
+        self.ready = False
+        self.running = False
+        self.warmup_stats = None
+        self._lock = threading.Lock()
+        self._conn, worker_conn = ctx.Pipe()
+        self.process = ctx.Process(target=target, args=(worker_conn,) + tuple(args), name=name)
+        self.process.daemon = True
+        self.process.start()
+        worker_conn.close()
+        self.logger.info(f"Worker {name} spawned (pid {self.process.pid})")
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def _receive(self, timeout: float) -> Optional[Tuple]:
+        deadline = time.time() + timeout
+        while self.is_alive():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                if self._conn.poll(min(remaining, WORKER_LIVENESS_INTERVAL)):
+                    return self._conn.recv()
+            except (EOFError, OSError):
+                return None
+        return None
+
+    def _wait_ready(self, timeout: float) -> bool:
+        if not self.ready:
+            reply = self._receive(timeout)
+            self.ready = reply is not None and reply[0] == WORKER_READY
+            if not self.ready:
+                self.logger.error(f"Worker {self.name} did not report ready")
+        return self.ready
+
+    def request(self, command: str, payload: Tuple = (), timeout: float = WORKER_REPLY_TIMEOUT) -> Optional[Tuple]:
+        with self._lock:
+            if not self._wait_ready(WORKER_READY_TIMEOUT):
+                return None
+            try:
+                while self._conn.poll():
+                    self.logger.debug(f"Worker {self.name} discarded stale reply: {self._conn.recv()[0]}")
+                self._conn.send((command,) + tuple(payload))
+            except (EOFError, OSError) as e:
+                self.logger.error(f"Worker {self.name} control channel failed: {e}")
+                return None
+            return self._receive(timeout)
+
+    def start(self, *payload: Any, timeout: float = WORKER_REPLY_TIMEOUT) -> bool:
+        reply = self.request(CMD_START, payload, timeout)
+        self.running = reply is not None and reply[0] == WORKER_STARTED
+        if not self.running:
+            self.logger.error(f"Worker {self.name} failed to start: {reply[1] if reply and len(reply) > 1 else 'no reply'}")
+        return self.running
+
+    def stop(self, timeout: float = WORKER_REPLY_TIMEOUT) -> bool:
+        if not self.is_alive():
+            return True
+        self.running = False
+        reply = self.request(CMD_STOP, timeout=timeout)
+        return reply is not None and reply[0] == WORKER_STOPPED
+
+    def reconfigure(self, *payload: Any, timeout: float = WORKER_CONFIGURE_TIMEOUT) -> bool:
+        reply = self.request(CMD_RECONFIGURE, payload, timeout)
+        self.warmup_stats = reply[1] if reply is not None and reply[0] == WORKER_CONFIGURED and len(reply) > 1 else None
+        return reply is not None and reply[0] == WORKER_CONFIGURED
+
+    def shutdown(self, timeout: float = 2.0):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            try:
+                self._conn.send((CMD_SHUTDOWN,))
+            except (EOFError, OSError):
+                pass
+            self.process.join(timeout=timeout)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join(timeout=1)
+                if self.process.is_alive():
+                    self.process.kill()
+        self.process.close()
+        self.process = None
+        self._conn.close()
+        self.ready = False
+        self.running = False
+        self.logger.info(f"Worker {self.name} shut down")
+
+def start_camera_worker(name: str, frame_event: EventType) -> WarmWorker:
+    return WarmWorker(name, _camera_worker_entry, (frame_event,), camera_logger)
+
+def create_feed_updates():
+    return get_context('spawn').Queue()
+
+class DetectionWorkerPool:
+    def __init__(self, size: int, result_mailboxes: List[ResultMailbox], results_event: EventType, confidence_value: ValueType, connection_state: ValueType):
+        ctx = get_context('spawn')
+        self.size = max(1, size)
+        self.result_mailboxes = result_mailboxes
+        self.results_event = results_event
+        self.confidence_value = confidence_value
+        self.connection_state = connection_state
+        self._claims_shared = ctx.Array('d', len(result_mailboxes) * CLAIM_FIELDS)
+        self._health_shared = ctx.RawArray('d', self.size * HEALTH_FIELDS)
+        self._cache_storage, self._cache_lock = create_cache_storage(ctx, len(result_mailboxes))
+        self.cache = PredictionCache(self._cache_storage, self._cache_lock)
+        self.claims = FrameClaims(self._claims_shared)
+        self.health = [WorkerHealth(self._health_shared, index) for index in range(self.size)]
+        self.feed_updates = [create_feed_updates() for _ in range(self.size)]
+        self.workers: List[Optional[WarmWorker]] = [None] * self.size
+        self.configured = [False] * self.size
+        self.feeds: Dict[int, List[Any]] = {}
+        self.restarts = 0
+        self._configure_lock = threading.Lock()
+
+    def _spawn(self, index: int) -> WarmWorker:
+        self.health[index].reset()
+        return WarmWorker(
+            f"detection-{index}",
+            _detection_worker_entry,
+            (self.feed_updates[index], self.result_mailboxes, self.results_event, self.confidence_value, self.connection_state, self._claims_shared, self._health_shared, self._cache_storage, self._cache_lock, index),
+            detection_logger
+        )
+
+    def ensure(self):
+        for index, worker in enumerate(self.workers):
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    worker.shutdown()
+                self.workers[index] = self._spawn(index)
+                self.configured[index] = False
+
+    def _worker_config(self, model_config: Dict[str, Any]) -> Dict[str, Any]:
+        worker_config = dict(model_config, warmup_runs=default_warmup_runs(model_config.get('backend', BACKEND_ROBOFLOW)), save_optimized=False)
+        if self.size > 1:
+            worker_config['threads'] = max(1, (os.cpu_count() or 1) // self.size)
+        return worker_config
+
+    def _configure(self, index: int, model_config: Dict[str, Any]) -> bool:
+        worker = self.workers[index]
+        self.configured[index] = worker.reconfigure(self._worker_config(model_config))
+        if self.configured[index] and worker.warmup_stats:
+            detection_logger.info(f"Worker {worker.name} warmed up: {worker.warmup_stats}")
+        return self.configured[index]
+
+    def reconfigure(self, model_config: Dict[str, Any]) -> bool:
+        with self._configure_lock:
+            self.ensure()
+            for index in range(self.size):
+                if not self.configured[index]:
+                    self._configure(index, model_config)
+            return all(self.configured)
+
+    def invalidate(self):
+        self.configured = [False] * self.size
+
+    def add_feed(self, camera_id: int, subscriber_specs: List[Any]):
+        self.feeds[camera_id] = subscriber_specs
+        self.claims.reset(camera_id)
+        self.cache.discard(camera_id)
+        for feed_updates, subscriber_spec in zip(self.feed_updates, subscriber_specs):
+            feed_updates.put((FEED_ADD, camera_id, subscriber_spec))
+
+    def remove_feed(self, camera_id: int):
+        self.feeds.pop(camera_id, None)
+        self.cache.discard(camera_id)
+        for feed_updates in self.feed_updates:
+            feed_updates.put((FEED_REMOVE, camera_id))
+
+    def start(self, options: Dict[str, Any], timeout: float = WORKER_REPLY_TIMEOUT) -> bool:
+        self.claims.reset()
+        options = dict(options, workers=self.size)
+        return all([worker.start(options, timeout=timeout) for worker in self.workers])
+
+    def stop(self) -> bool:
+        stopped = True
+        for index, worker in enumerate(self.workers):
+            if worker and not worker.stop():
+                detection_logger.warning(f"Worker {worker.name} did not acknowledge stop, shutting it down")
+                worker.shutdown()
+                self.workers[index] = None
+                stopped = False
+        self.feeds = {}
+        return stopped
+
+    def check_health(self, model_config: Dict[str, Any], options: Dict[str, Any]) -> int:
+        restarted = 0
+        for index, worker in enumerate(self.workers):
+            if worker is not None and worker.is_alive():
+                continue
+            detection_logger.error(f"Detection worker {index} died ({self.health[index].snapshot(time.time())}), restarting")
+            if worker is not None:
+                worker.shutdown()
+            worker = self.workers[index] = self._spawn(index)
+            with self._configure_lock:
+                self._configure(index, model_config)
+            for camera_id, subscriber_specs in self.feeds.items():
+                self.feed_updates[index].put((FEED_ADD, camera_id, subscriber_specs[index]))
+            if self.configured[index] and worker.start(dict(options, workers=self.size)):
+                restarted += 1
+        self.restarts += restarted
+        return restarted
+
+    def detection_fps(self) -> float:
+        return sum(health.snapshot(0.0)['rate'] for health in self.health)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        return [dict(health.snapshot(now), alive=bool(worker and worker.is_alive())) for health, worker in zip(self.health, self.workers)]
+
+    def shutdown(self):
+        for index, worker in enumerate(self.workers):
+            if worker is not None:
+                worker.shutdown()
+            self.workers[index] = None
+        self.invalidate()
+
+def _receive_command(control: Connection) -> Tuple:
+    try:
+        return control.recv()
+    except (EOFError, OSError):
+        return (CMD_SHUTDOWN,)
+
+def _camera_worker_entry(control: Connection, frame_event: EventType):
+    control.send((WORKER_READY,))
+    while True:
+        command = _receive_command(control)
+        if command[0] == CMD_SHUTDOWN:
+            return
+        if command[0] == CMD_START:
+            _run_camera(control, frame_event, *command[1:])
+        elif command[0] == CMD_STOP:
+            control.send((WORKER_STOPPED,))
+        else:
+            control.send((WORKER_ERROR, f"Unsupported camera command: {command[0]}"))
+
+def _run_camera(control: Connection, frame_event: EventType, ring_spec: FrameRingSpec, source_config: Dict[str, Any], device_index: int, motion_config: Dict[str, Any]):
+    ring = SharedFrameRing.attach(ring_spec)
+    source = create_frame_source(source_config, device_index, CAM_WIDTH, CAM_HEIGHT, CAM_FRAMES)
+    motion_gate = MotionGate(motion_config['area']) if motion_config.get('enabled') else None
+    try:
+        if not source.open():
+            control.send((WORKER_ERROR, f"Failed to open frame source: {type(source).__name__}"))
+            return
+        control.send((WORKER_STARTED, source.fps))
+        _camera_loop(ring, control, frame_event, source, motion_gate)
+    except Exception as e:
+        camera_logger.error(f"Camera worker error: {e}")
+        control.send((WORKER_ERROR, str(e)))
+    finally:
+        source.release()
+        ring.close()
+
+def _detection_worker_entry(control: Connection, feed_updates: QueueType, result_mailboxes: List[ResultMailbox], results_event: EventType, confidence_value: ValueType, connection_state: ValueType, claims_shared: Any, health_shared: Any, cache_storage: Any, cache_lock: Any, index: int):
+    scheduler = FeedScheduler(feed_updates)
+    claims = FrameClaims(claims_shared)
+    health = WorkerHealth(health_shared, index)
+    backend = None
+    control.send((WORKER_READY,))
+    try:
+        while True:
+            command = _receive_command(control)
+            if command[0] == CMD_SHUTDOWN:
+                return
+            if command[0] == CMD_RECONFIGURE:
+                if backend:
+                    backend.close()
+                    backend = None
+                try:
+                    backend = create_detection_backend(command[1])
+                except Exception as e:
+                    detection_logger.error(f"Failed to create detection backend: {e}")
+                    control.send((WORKER_ERROR, str(e)))
+                    continue
+                stats = None
+                if command[1].get('warmup_runs'):
+                    try:
+                        stats = warm_up(backend, CAM_WIDTH, CAM_HEIGHT, command[1]['warmup_runs'])
+                    except Exception as e:
+                        detection_logger.warning(f"Detection backend warm-up failed: {e}")
+                detection_logger.info(f"Detection backend ready: {backend.name}")
+                control.send((WORKER_CONFIGURED, stats))
+            elif command[0] == CMD_START:
+                if backend is None:
+                    control.send((WORKER_ERROR, "No model configured"))
+                    continue
+                tile_grid = tuple(command[1].get('tile_grid', DEFAULT_TILE_GRID))
+                run_backend = backend if tile_grid == DEFAULT_TILE_GRID else TiledBackend(backend, tile_grid, command[1].get('tile_overlap', DEFAULT_TILE_OVERLAP))
+                control.send((WORKER_STARTED,))
+                try:
+                    _detection_loop(scheduler, run_backend, result_mailboxes, results_event, control, command[1], confidence_value, connection_state, claims, health, cache_storage, cache_lock)
+                finally:
+                    if run_backend is not backend:
+                        run_backend.close()
+                health.set_rate(0.0)
+                scheduler.close()
+            elif command[0] == CMD_STOP:
+                control.send((WORKER_STOPPED,))
+            else:
+                control.send((WORKER_ERROR, f"Unsupported detection command: {command[0]}"))
+    finally:
+        scheduler.close()
+        if backend:
+            backend.close()
+
+def _camera_loop(ring: SharedFrameRing, control: Connection, frame_event: EventType, source: FrameSource, motion_gate: Optional[MotionGate] = None):
+    frame_interval = 1.0 / (source.fps or CAM_FRAMES)
+    camera_logger.info(f"{type(source).__name__} opened at {1.0 / frame_interval:.1f} fps (native pacing: {source.native_rate})")
+    next_grab = time.perf_counter()
+    window_start = next_grab
+    grabbed = 0
+    published = 0
+
+    while not control.poll() and source.is_open():
+        if not source.native_rate:
+            delay = next_grab - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_grab = max(next_grab + frame_interval, time.perf_counter() - frame_interval)
+
+        if not source.grab():
             time.sleep(0.1)
             continue
-            
-        try:
-            frame_queue.put(frame, timeout=0.1)
-            last_frame_time = time.time()
-        except Full:
-            camera_logger.debug("Frame queue full, maintaining frame rate")
-            last_frame_time = time.time()
-            
-    cap.release()
-
-def _detection_loop(frame_queue: QueueType, result_queue: QueueType, stop_event: EventType, model_config: Dict[str, Any], confidence_value: ValueType, connection_state: ValueType):
+        grabbed += 1
+
+        if ring.has_demand():
+            ret, frame = source.retrieve()
+            if ret:
+                changed = motion_gate.check(frame) if motion_gate else True
+                ring.publish(frame, time.time(), changed)
+                frame_event.set()
+                published += 1
+
+        now = time.perf_counter()
+        if now - window_start >= RATE_WINDOW:
+            elapsed = now - window_start
+            ring.set_rates(grabbed / elapsed, published / elapsed)
+            camera_logger.debug(f"Capture rates: grab {grabbed / elapsed:.1f} fps, publish {published / elapsed:.1f} fps")
+            window_start = now
+            grabbed = 0
+            published = 0
+
+def _set_connection_state(connection_state: ValueType, results_event: EventType, value: int):
+    if connection_state.value != value:
+        connection_state.value = value
+        results_event.set()
+
+def _post_records(mailbox: ResultMailbox, camera_id: int, seq: int, timestamp: float, skipped: int, records, class_names: Tuple[str, ...]):
+    records['frame_seq'] = seq
+    mailbox.post({
+        'camera_id': camera_id,
+        'seq': seq,
+        'timestamp': timestamp,
+        'skipped': skipped,
+        'records': encode_records(records),
+        'classes': class_names
+    })
+
+def _detection_loop(scheduler: FeedScheduler, backend: DetectionBackend, result_mailboxes: List[ResultMailbox], results_event: EventType, control: Connection, options: Dict[str, Any], confidence_value: ValueType, connection_state: ValueType, claims: FrameClaims, health: WorkerHealth, cache_storage: Any, cache_lock: Any):
     import time
-    model = model_config.get('model')
-    frame_skip = 2
-    frame_count = 0
+    motion_refresh = options.get('motion_refresh', DEFAULT_REFRESH_INTERVAL)
+    confidence_floor = options.get('confidence_floor', DEFAULT_CONFIDENCE_FLOOR)
+    max_in_flight = options.get('max_in_flight', 1) if backend.concurrent else 1
+    pipeline = InferencePipeline(backend, max_in_flight)
+    frame_skip = AdaptiveFrameSkip(options.get('target_fps', DEFAULT_TARGET_FPS), options.get('max_age', DEFAULT_MAX_AGE), pipeline.max_in_flight * options.get('workers', 1))
+    cache_ttl = options.get('cache_ttl', DEFAULT_CACHE_TTL)
+    cache = PredictionCache(cache_storage, cache_lock, options.get('cache_threshold', DEFAULT_HASH_THRESHOLD), cache_ttl)
+    pending_hashes = {}
+    frames_skipped = {}
+    frames_static = {}
     retry_delay = 0.1
     max_retry_delay = 2.0
-    
-    while not stop_event.is_set():
-        try:
-            frame = frame_queue.get(timeout=0.1)
-            frame_count += 1
-            
-            if frame_count % frame_skip != 0:
-                continue
-                
-            target_width, target_height = 320, 240
-            frame_small = cv2.resize(frame, (target_width, target_height))
-            frame_rgb = cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB)
-            confidence = confidence_value.value
-            connection_state.value = 0
-            
+    retry_at = 0.0
+    detection_logger.info(f"Detection loop running on {backend.name} with {pipeline.max_in_flight} in-flight request(s)")
+
+    try:
+        while not control.poll():
             try:
-                results = model.predict(frame_rgb, confidence=confidence, overlap=0.5).json()
-                predictions = results.get('predictions', [])
-                if predictions:
-                    scale_x = frame.shape[1] / target_width
-                    scale_y = frame.shape[0] / target_height
-                    
-                    for pred in predictions:
-                        pred['x'] = pred['x'] * scale_x
-                        pred['y'] = pred['y'] * scale_y
-                        if 'width' in pred:
-                            pred['width'] = pred['width'] * scale_x
-                        if 'height' in pred:
-                            pred['height'] = pred['height'] * scale_y
-                            
-                    result_queue.put(predictions, timeout=0.1)
-                retry_delay = 0.1
-                
-            except Exception as e:
-                detection_logger.error(f"Model prediction error: {str(e)}")
-                connection_state.value = 2
-                time.sleep(retry_delay)
-                retry_delay = min(retry_delay * 2, max_retry_delay)
-                continue
-                
-        except Empty:
-            time.sleep(0.01)
-        except Exception as e:
-            detection_logger.error(f"Detection loop error: {str(e)}")
-            connection_state.value = 1
-            time.sleep(0.1)
+                for result in pipeline.completed():
+                    camera_hashes = pending_hashes.get(result.camera_id, {})
+                    cache_key = camera_hashes.pop(result.seq, None)
+                    for stale_seq in [seq for seq in camera_hashes if seq < result.seq]:
+                        del camera_hashes[stale_seq]
+                    if result.error is not None:
+                        health.failed()
+                        detection_logger.error(f"Model prediction error: {str(result.error)}")
+                        _set_connection_state(connection_state, results_event, 2)
+                        claims.forget(result.camera_id)
+                        retry_at = time.time() + retry_delay
+                        retry_delay = min(retry_delay * 2, max_retry_delay)
+                        continue
+                    retry_delay = 0.1
+                    health.completed()
+                    frame_skip.observe(result.latency, time.time() - result.timestamp, len(scheduler.camera_ids))
+                    if cache_key is not None and result.predictions is not None:
+                        cache.store(result.camera_id, result.seq, cache_key[0], cache_key[1], result.predictions)
+                    if len(result.predictions) and result.camera_id in scheduler.camera_ids:
+                        _post_records(result_mailboxes[result.camera_id], result.camera_id, result.seq, result.timestamp, frames_skipped.get(result.camera_id, 0), result.predictions, backend.class_table.names)
+                        results_event.set()
+                        frames_skipped[result.camera_id] = 0
+
+                now = time.time()
+                health.beat(now)
+                rate = frame_skip.update_rate(now)
+                if rate is not None:
+                    health.set_rate(rate)
+
+                if pipeline.full or time.time() < retry_at:
+                    pipeline.wait(FRAME_POLL_INTERVAL)
+                    if not pipeline.in_flight:
+                        time.sleep(FRAME_POLL_INTERVAL)
+                    continue
+
+                scheduler.apply_updates()
+                scheduled = scheduler.next_delivery()
+                if scheduled is None:
+                    pipeline.wait(FRAME_POLL_INTERVAL)
+                    if not pipeline.in_flight:
+                        time.sleep(FRAME_POLL_INTERVAL)
+                    continue
+                camera_id, delivery = scheduled
 
-def clean_up_process(process: Any, stop_event: EventType):
-    if not process:
-        return
-        
-    if process.is_alive():
-        stop_event.set()
-        process.join(timeout=2)
-        if process.is_alive():
-            process.terminate()
-            process.join(timeout=1)
-            if process.is_alive():
-                process.kill()
-    process.close()
+                now = time.time()
+                claim, skipped = claims.claim(camera_id, delivery.seq, now, frame_skip.interval, delivery.change_seq, motion_refresh)
+                if claim != CLAIM_GRANTED and claim != CLAIM_STATIC:
+                    continue
+                frames_skipped[camera_id] = frames_skipped.get(camera_id, 0) + skipped
+                if claim == CLAIM_STATIC:
+                    reused = cache.latest(camera_id, claims.inferred(camera_id))
+                    if reused is None:
+                        frames_skipped[camera_id] += 1
+                        continue
+                    frames_static[camera_id] = frames_static.get(camera_id, 0) + 1
+                    health.completed()
+                    frame_skip.served()
+                    if len(reused):
+                        _post_records(result_mailboxes[camera_id], camera_id, delivery.seq, delivery.timestamp, frames_skipped[camera_id], reused, backend.class_table.names)
+                        results_event.set()
+                        frames_skipped[camera_id] = 0
+                    continue
+                if frames_static.get(camera_id):
+                    detection_logger.debug(f"Camera {camera_id}: reused predictions for {frames_static[camera_id]} static frame(s)")
+                    frames_static[camera_id] = 0
+
+                delivery = scheduler.snapshot(camera_id, delivery)
+                if delivery is None:
+                    claims.forget(camera_id)
+                    frames_skipped[camera_id] += 1
+                    continue
+                confidence = min(confidence_floor, confidence_value.value)
+                digest = frame_hash(delivery.frame)
+                if cache_ttl > 0:
+                    cached = cache.lookup(camera_id, digest, confidence, now, delivery.seq)
+                    if cached is not None:
+                        health.completed()
+                        frame_skip.served()
+                        if len(cached):
+                            _post_records(result_mailboxes[camera_id], camera_id, delivery.seq, delivery.timestamp, frames_skipped.get(camera_id, 0), cached, backend.class_table.names)
+                            results_event.set()
+                            frames_skipped[camera_id] = 0
+                        continue
+                pending_hashes.setdefault(camera_id, {})[delivery.seq] = (digest, confidence)
+
+                _set_connection_state(connection_state, results_event, 0)
+                pipeline.submit(camera_id, delivery, confidence)
+
+            except Exception as e:
+                detection_logger.error(f"Detection loop error: {str(e)}")
+                _set_connection_state(connection_state, results_event, 1)
+                time.sleep(0.1)
+    finally:
+        pipeline.close()
+        cache.close()
@@ -0,0 +1,137 @@
+import logging
+import threading
+import time
+import numpy as np
+
+detection_logger = logging.getLogger("detection")
+
+TRACK_IOU_THRESHOLD = 0.3
+TRACK_MAX_AGE = 1.5
+TRACK_MIN_HITS = 2
+MAX_EXTRAPOLATION = 0.5
+POSITION_NOISE = 10.0
+SIZE_NOISE = 5.0
+VELOCITY_NOISE = 50.0
+MEASUREMENT_NOISE = 8.0
+
+def _corners(boxes):
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    half = boxes[:, 2:] / 2
+    return np.hstack((boxes[:, :2] - half, boxes[:, :2] + half))
+
+def iou_matrix(first, second):
+    a, b = _corners(first), _corners(second)
+    inter_w = np.clip(np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(a[:, None, 0], b[None, :, 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(a[:, None, 1], b[None, :, 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+class KalmanBoxTrack:
+    _measurement = np.hstack((np.eye(4), np.zeros((4, 2))))
+
+    def __init__(self, track_id, detection, timestamp):
+        self.track_id = track_id
+        self.detection = detection
+        self.state = np.array([detection['x'], detection['y'], detection['width'], detection['height'], 0.0, 0.0])
+        self.covariance = np.diag([MEASUREMENT_NOISE, MEASUREMENT_NOISE, MEASUREMENT_NOISE, MEASUREMENT_NOISE, VELOCITY_NOISE * 10, VELOCITY_NOISE * 10]) ** 2
+        self.updated_at = timestamp
+        self.hits = 1
+        self.last_round = 0
+
+    @staticmethod
+    def _transition(dt):
+        transition = np.eye(6)
+        transition[0, 4] = dt
+        transition[1, 5] = dt
+        return transition
+
+    def predict(self, timestamp):
+        dt = timestamp - self.updated_at
+        if dt <= 0:
+            return self.state.copy()
+        state = self._transition(min(dt, MAX_EXTRAPOLATION)) @ self.state
+        state[2:4] = np.maximum(state[2:4], 1.0)
+        return state
+
+    def update(self, detection, timestamp):
+        dt = max(timestamp - self.updated_at, 0.0)
+        transition = self._transition(dt)
+        noise = np.diag([POSITION_NOISE, POSITION_NOISE, SIZE_NOISE, SIZE_NOISE, VELOCITY_NOISE, VELOCITY_NOISE]) ** 2 * max(dt, 1e-3)
+        state = transition @ self.state
+        covariance = transition @ self.covariance @ transition.T + noise
+        measured = np.array([detection['x'], detection['y'], detection['width'], detection['height']])
+        innovation = measured - self._measurement @ state
+        innovation_cov = self._measurement @ covariance @ self._measurement.T + np.eye(4) * MEASUREMENT_NOISE ** 2
+        gain = covariance @ self._measurement.T @ np.linalg.inv(innovation_cov)
+        self.state = state + gain @ innovation
+        self.covariance = (np.eye(6) - gain @ self._measurement) @ covariance
+        self.detection = detection
+        self.updated_at = timestamp
+        self.hits += 1
+
+    def as_detection(self, timestamp):
+        x, y, width, height = self.predict(timestamp)[:4]
+        return dict(self.detection, x=float(x), y=float(y), width=float(width), height=float(height), track_id=self.track_id)
+
+class ObjectTracker:
+    def __init__(self, iou_threshold=TRACK_IOU_THRESHOLD, max_age=TRACK_MAX_AGE, min_hits=TRACK_MIN_HITS):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self._tracks = []
+        self._next_id = 1
+        self._round = 0
+        self._round_at = None
+        self._lock = threading.Lock()
+
+    def _match(self, detections, timestamp):
+        if not self._tracks or not detections:
+            return [], list(range(len(self._tracks))), list(range(len(detections)))
+        predicted = np.array([track.predict(timestamp)[:4] for track in self._tracks])
+        measured = np.array([[det['x'], det['y'], det.get('width', 0.0), det.get('height', 0.0)] for det in detections])
+        overlaps = iou_matrix(predicted, measured)
+        same_class = np.array([[track.detection['class'] == det['class'] for det in detections] for track in self._tracks])
+        overlaps[~same_class] = 0.0
+        matches = []
+        for flat in np.argsort(-overlaps, axis=None):
+            track_index, det_index = np.unravel_index(flat, overlaps.shape)
+            if overlaps[track_index, det_index] < self.iou_threshold:
+                break
+            if all(track_index != t and det_index != d for t, d in matches):
+                matches.append((int(track_index), int(det_index)))
+        matched_tracks = {t for t, _ in matches}
+        matched_dets = {d for _, d in matches}
+        return matches, [t for t in range(len(self._tracks)) if t not in matched_tracks], [d for d in range(len(detections)) if d not in matched_dets]
+
+    def update(self, detections, timestamp):
+        detections = [det for det in detections if det.get('width') and det.get('height')]
+        with self._lock:
+            self._round += 1
+            self._round_at = time.time()
+            matches, _, unmatched = self._match(detections, timestamp)
+            for track_index, det_index in matches:
+                self._tracks[track_index].update(detections[det_index], timestamp)
+                self._tracks[track_index].last_round = self._round
+            for det_index in unmatched:
+                track = KalmanBoxTrack(self._next_id, detections[det_index], timestamp)
+                track.last_round = self._round
+                self._tracks.append(track)
+                self._next_id += 1
+            self._tracks = [track for track in self._tracks if timestamp - track.updated_at <= self.max_age]
+
+    def _displayable(self, track):
+        return track.last_round == self._round and (track.hits >= self.min_hits or self._round < self.min_hits)
+
+    def tracks(self, timestamp):
+        with self._lock:
+            if self._round_at is None or timestamp - self._round_at > self.max_age:
+                return []
+            return [track.as_detection(timestamp) for track in self._tracks if self._displayable(track)]
+
+    def reset(self):
+        with self._lock:
+            self._tracks = []
+            self._round = 0
+            self._round_at = None
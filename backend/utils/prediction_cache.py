@@ -0,0 +1,111 @@
+import logging
+import time
+import numpy as np
+import cv2
+from backend.utils.detection_records import DETECTION_DTYPE
+
+detection_logger = logging.getLogger("detection")
+
+HASH_WIDTH = 9
+HASH_HEIGHT = 8
+HASH_PRESCALE = 16
+CACHE_ENTRIES_PER_CAMERA = 4
+MAX_CACHED_RECORDS = 256
+DEFAULT_HASH_THRESHOLD = 4
+DEFAULT_CACHE_TTL = 2.0
+STATS_LOG_INTERVAL = 200
+CACHE_ENTRY_DTYPE = np.dtype([
+    ('seq', np.int64),
+    ('digest', np.uint64),
+    ('confidence', np.float64),
+    ('stored_at', np.float64),
+    ('count', np.int64),
+    ('records', DETECTION_DTYPE, (MAX_CACHED_RECORDS,))
+])
+
+def frame_hash(frame):
+    small = cv2.resize(frame, (HASH_WIDTH * HASH_PRESCALE, HASH_HEIGHT * HASH_PRESCALE), interpolation=cv2.INTER_LINEAR)
+    small = cv2.resize(small, (HASH_WIDTH, HASH_HEIGHT), interpolation=cv2.INTER_AREA)
+    if small.ndim == 3:
+        small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+def hamming_distance(first, second):
+    return bin(first ^ second).count("1")
+
+def create_cache_storage(ctx, cameras):
+    return ctx.RawArray('b', cameras * CACHE_ENTRIES_PER_CAMERA * CACHE_ENTRY_DTYPE.itemsize), ctx.Lock()
+
+class PredictionCache:
+    def __init__(self, storage, lock, threshold=DEFAULT_HASH_THRESHOLD, ttl=DEFAULT_CACHE_TTL):
+        self.threshold = threshold
+        self.ttl = ttl
+        self._entries = np.frombuffer(storage, dtype=CACHE_ENTRY_DTYPE).reshape(-1, CACHE_ENTRIES_PER_CAMERA)
+        self._lock = lock
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, camera_id, digest, confidence, now=None, seq=None):
+        now = time.time() if now is None else now
+        confidence = round(confidence, 2)
+        best = None
+        with self._lock:
+            for entry in self._entries[camera_id]:
+                if entry['stored_at'] <= 0 or now - entry['stored_at'] >= self.ttl or entry['confidence'] != confidence:
+                    continue
+                distance = hamming_distance(digest, int(entry['digest']))
+                if distance <= self.threshold and (best is None or distance < best[0]):
+                    best = (distance, entry)
+            if best is not None and seq is not None:
+                best[1]['seq'] = seq
+            records = None if best is None else best[1]['records'][:best[1]['count']].copy()
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._log_stats()
+        return records
+
+    def latest(self, camera_id, seq):
+        with self._lock:
+            for entry in self._entries[camera_id]:
+                if entry['stored_at'] > 0 and entry['seq'] == seq:
+                    return entry['records'][:entry['count']].copy()
+        return None
+
+    def store(self, camera_id, seq, digest, confidence, predictions, now=None):
+        if len(predictions) > MAX_CACHED_RECORDS:
+            return
+        confidence = round(confidence, 2)
+        with self._lock:
+            entries = self._entries[camera_id]
+            matching = np.flatnonzero((entries['digest'] == digest) & (entries['confidence'] == confidence))
+            entry = entries[matching[0] if len(matching) else int(np.argmin(entries['stored_at']))]
+            entry['seq'] = seq
+            entry['digest'] = digest
+            entry['confidence'] = confidence
+            entry['stored_at'] = time.time() if now is None else now
+            entry['count'] = len(predictions)
+            entry['records'][:len(predictions)] = predictions
+
+    def discard(self, camera_id):
+        with self._lock:
+            self._entries[camera_id]['stored_at'] = 0.0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': round(self.hit_rate, 3)}
+
+    def _log_stats(self):
+        if (self.hits + self.misses) % STATS_LOG_INTERVAL == 0:
+            detection_logger.info(f"Prediction cache stats: {self.stats()}")
+
+    def close(self):
+        if self.hits + self.misses:
+            detection_logger.info(f"Prediction cache stats: {self.stats()}")
+        self._entries = None
@@ -1,14 +1,29 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QComboBox, QLabel, QPushButton, QMessageBox
+    QComboBox, QLabel, QPushButton, QMessageBox,
+    QLineEdit, QFileDialog, QCheckBox
 )
 from PyQt6.QtCore import pyqtSignal
 from frontend.themes.theme_manager import ThemeManager
+from backend.utils.frame_sources import SOURCE_TYPES, SOURCE_VIDEO, FILE_SOURCE_TYPES, default_source_type
+from backend.utils.motion_gate import get_motion_config
+from backend.services.detection_backends import BACKEND_TYPES, BACKEND_ONNX, BACKEND_ROBOFLOW
+from . import settings_manager
 from .settings_manager import get_setting, update_setting, save_settings
 
-def save_settings_dialog(theme_combo, setup_mode, settings_updated, parent):
+def save_settings_dialog(theme_combo, setup_mode, settings_updated, parent, source_combo=None, source_path_edit=None, motion_gate_check=None, model_backend_combo=None, model_path_edit=None):
     try:
         update_setting("theme", "theme", theme_combo.currentText())
+        if source_combo is not None:
+            update_setting("camera", "source", source_combo.currentText())
+        if source_path_edit is not None:
+            update_setting("camera", "path", source_path_edit.text().strip())
+        if motion_gate_check is not None:
+            update_setting("camera", "motion_gate", str(motion_gate_check.isChecked()).lower())
+        if model_backend_combo is not None:
+            update_setting("model", "backend", model_backend_combo.currentText())
+        if model_path_edit is not None:
+            update_setting("model", "path", model_path_edit.text().strip())
         save_settings()
         if setup_mode:
             QMessageBox.information(
@@ -44,7 +59,12 @@ class SettingsDialog(QDialog):
         
         theme_group = self._create_theme_group()
         layout.addWidget(theme_group)
-        
+
+        camera_group = self._create_camera_group()
+        layout.addWidget(camera_group)
+
+        model_group = self._create_model_group()
+        layout.addWidget(model_group)
 
         button_layout = self._create_button_layout()
         layout.addLayout(button_layout)
@@ -64,6 +84,78 @@ class SettingsDialog(QDialog):
         layout.addWidget(self.theme_combo)
         return group
     
+    def _create_camera_group(self):
+        group = QGroupBox("Camera Source")
+        layout = QVBoxLayout(group)
+        layout.setSpacing(8)
+        layout.setContentsMargins(15, 15, 15, 15)
+        self.source_combo = QComboBox()
+        self.source_combo.addItems(SOURCE_TYPES)
+        self.source_combo.setCurrentText(get_setting("camera", "source") or default_source_type())
+        self.source_combo.currentTextChanged.connect(self._update_source_path_state)
+        path_layout = QHBoxLayout()
+        self.source_path_edit = QLineEdit(get_setting("camera", "path") or "")
+        self.source_path_edit.setPlaceholderText("Video file or image folder")
+        self.source_browse_btn = QPushButton("Browse")
+        self.source_browse_btn.clicked.connect(self._browse_source_path)
+        path_layout.addWidget(self.source_path_edit)
+        path_layout.addWidget(self.source_browse_btn)
+        layout.addWidget(QLabel("Capture Backend:"))
+        layout.addWidget(self.source_combo)
+        layout.addWidget(QLabel("Source Path:"))
+        layout.addLayout(path_layout)
+        self.motion_gate_check = QCheckBox("Skip detection while the scene is static")
+        self.motion_gate_check.setChecked(get_motion_config(settings_manager)['enabled'])
+        layout.addWidget(self.motion_gate_check)
+        self._update_source_path_state(self.source_combo.currentText())
+        return group
+
+    def _update_source_path_state(self, source_type):
+        enabled = source_type in FILE_SOURCE_TYPES
+        self.source_path_edit.setEnabled(enabled)
+        self.source_browse_btn.setEnabled(enabled)
+
+    def _browse_source_path(self):
+        if self.source_combo.currentText() == SOURCE_VIDEO:
+            path, _ = QFileDialog.getOpenFileName(self, "Select Video File", "", "Videos (*.mp4 *.avi *.mkv *.mov)")
+        else:
+            path = QFileDialog.getExistingDirectory(self, "Select Image Folder")
+        if path:
+            self.source_path_edit.setText(path)
+
+    def _create_model_group(self):
+        group = QGroupBox("Detection Model")
+        layout = QVBoxLayout(group)
+        layout.setSpacing(8)
+        layout.setContentsMargins(15, 15, 15, 15)
+        self.model_backend_combo = QComboBox()
+        self.model_backend_combo.addItems(BACKEND_TYPES)
+        self.model_backend_combo.setCurrentText(get_setting("model", "backend") or BACKEND_ROBOFLOW)
+        self.model_backend_combo.currentTextChanged.connect(self._update_model_path_state)
+        path_layout = QHBoxLayout()
+        self.model_path_edit = QLineEdit(get_setting("model", "path") or "")
+        self.model_path_edit.setPlaceholderText("Exported .onnx model file")
+        self.model_browse_btn = QPushButton("Browse")
+        self.model_browse_btn.clicked.connect(self._browse_model_path)
+        path_layout.addWidget(self.model_path_edit)
+        path_layout.addWidget(self.model_browse_btn)
+        layout.addWidget(QLabel("Inference Backend:"))
+        layout.addWidget(self.model_backend_combo)
+        layout.addWidget(QLabel("Model File:"))
+        layout.addLayout(path_layout)
+        self._update_model_path_state(self.model_backend_combo.currentText())
+        return group
+
+    def _update_model_path_state(self, backend):
+        enabled = backend == BACKEND_ONNX
+        self.model_path_edit.setEnabled(enabled)
+        self.model_browse_btn.setEnabled(enabled)
+
+    def _browse_model_path(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select ONNX Model", "", "ONNX models (*.onnx)")
+        if path:
+            self.model_path_edit.setText(path)
+
     def _create_button_layout(self):
         layout = QHBoxLayout()
         layout.setSpacing(10)
@@ -86,7 +178,12 @@ class SettingsDialog(QDialog):
             self.theme_combo,
             self.setup_mode,
             self.settings_updated,
-            self
+            self,
+            self.source_combo,
+            self.source_path_edit,
+            self.motion_gate_check,
+            self.model_backend_combo,
+            self.model_path_edit
         )
         if result:
             self.accept()
@@ -4,7 +4,7 @@ import os
 import shutil
 
 APP_NAME = "ProctorAI"
-CONFIG_DIR = Path(os.getenv('APPDATA')) / APP_NAME
+CONFIG_DIR = Path(os.getenv('APPDATA') or Path.home() / ".config") / APP_NAME
 CONFIG_FILE = CONFIG_DIR / "config.ini"
 
 _settings_data = {}
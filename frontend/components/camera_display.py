@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
-    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QComboBox, QSizePolicy, QFrame
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
+    QLabel, QComboBox, QSizePolicy, QFrame, QPushButton
 )
 from .buttons import AnimatedStateButton
 from PyQt6.QtCore import Qt, pyqtSignal
@@ -8,13 +8,17 @@ from PyQt6.QtGui import QPixmap, QImage
 import cv2
 from backend.utils.gui.frame_display_manager import display_frame
 
+PRIMARY_CAMERA_ID = 0
+PANE_STYLE = "QLabel { background-color: black; border: 2px solid #444444; }"
+
 class CameraDisplayDock(QDockWidget):
     camera_toggle_requested = pyqtSignal()
+    camera_add_requested = pyqtSignal()
 
     def __init__(self, title, parent=None):
         super().__init__(title, parent)
         self.setAllowedAreas(Qt.DockWidgetArea.LeftDockWidgetArea | Qt.DockWidgetArea.RightDockWidgetArea)
-        self._last_frame = None
+        self._last_frames = {}
         self._init_ui()
 
     def _init_ui(self):
@@ -37,6 +41,10 @@ class CameraDisplayDock(QDockWidget):
         self.camera_button = AnimatedStateButton("Start Camera")
         self.camera_button.clicked.connect(lambda: self.camera_toggle_requested.emit())
         controls_layout.addWidget(self.camera_button)
+        self.add_camera_button = QPushButton("Add Camera")
+        self.add_camera_button.setEnabled(False)
+        self.add_camera_button.clicked.connect(lambda: self.camera_add_requested.emit())
+        controls_layout.addWidget(self.add_camera_button)
         parent_layout.addLayout(controls_layout)
 
     def _setup_display_container(self, parent_layout):
@@ -44,24 +52,68 @@ class CameraDisplayDock(QDockWidget):
         self.display_container.setFrameStyle(QFrame.Shape.NoFrame)
         self.display_container.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
-        display_layout = QVBoxLayout(self.display_container)
-        display_layout.setContentsMargins(0, 0, 0, 0)
-        display_layout.setSpacing(0)
-        display_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.display_layout = QGridLayout(self.display_container)
+        self.display_layout.setContentsMargins(0, 0, 0, 0)
+        self.display_layout.setSpacing(4)
+        self.display_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        self.display_label = QLabel()
-        self.display_label.setStyleSheet("QLabel { background-color: black; border: 2px solid #444444; }")
+        self.display_label = self._create_pane()
         self.display_label.setMinimumSize(640, 360)
-        self.display_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.display_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.display_labels = {PRIMARY_CAMERA_ID: self.display_label}
         
-        display_layout.addWidget(self.display_label, 1)
+        self.display_layout.addWidget(self.display_label, 0, 0)
         parent_layout.addWidget(self.display_container, 1)
 
+    def _create_pane(self):
+        label = QLabel()
+        label.setStyleSheet(PANE_STYLE)
+        label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        return label
+
+    def _grid_shape(self):
+        count = len(self.display_labels)
+        columns = 1 if count == 1 else 2
+        rows = (count + columns - 1) // columns
+        return rows, columns
+
+    def _arrange_panes(self):
+        for label in self.display_labels.values():
+            self.display_layout.removeWidget(label)
+        _, columns = self._grid_shape()
+        for position, camera_id in enumerate(sorted(self.display_labels)):
+            self.display_layout.addWidget(self.display_labels[camera_id], position // columns, position % columns)
+        self.display_label.setMinimumSize(640 // columns, 360 // columns)
+        self._last_size = None
+        self._resize_panes()
+
+    def add_pane(self, camera_id, device_name=""):
+        if camera_id not in self.display_labels:
+            self.display_labels[camera_id] = self._create_pane()
+            self._arrange_panes()
+        self.display_labels[camera_id].setToolTip(device_name)
+
+    def remove_pane(self, camera_id):
+        self._last_frames.pop(camera_id, None)
+        if camera_id == PRIMARY_CAMERA_ID:
+            return
+        label = self.display_labels.pop(camera_id, None)
+        if label is not None:
+            self.display_layout.removeWidget(label)
+            label.deleteLater()
+            self._arrange_panes()
+
+    def label_for(self, camera_id):
+        return self.display_labels.get(camera_id, self.display_label)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        available_width = int(self.width() * 0.95)
-        available_height = int((self.height() - self.camera_button.height() - 40) * 0.95)
+        self._resize_panes()
+
+    def _resize_panes(self):
+        rows, columns = self._grid_shape()
+        available_width = int(self.width() * 0.95 / columns)
+        available_height = int((self.height() - self.camera_button.height() - 40) * 0.95 / rows)
         
         max_width = available_width
         target_height = int(max_width * 9 / 16)
@@ -72,15 +124,17 @@ class CameraDisplayDock(QDockWidget):
             
         if (max_width, target_height) != self._last_size:
             self._last_size = (max_width, target_height)
-            self.display_label.setFixedSize(max_width, target_height)
+            for label in self.display_labels.values():
+                label.setFixedSize(max_width, target_height)
 
-    def update_display(self, frame=None, clear_markers=False):
+    def update_display(self, camera_id=PRIMARY_CAMERA_ID, frame=None, clear_markers=False):
         main_window = self.parent().window()
         if frame is not None:
-            self._last_frame = frame
-        frame_to_display = self._last_frame
+            self._last_frames[camera_id] = frame
+        frame_to_display = self._last_frames.get(camera_id)
         if frame_to_display is None:
             return
+        display_label = self.label_for(camera_id)
             
         if clear_markers:
             height, width = frame_to_display.shape[:2]
@@ -88,25 +142,27 @@ class CameraDisplayDock(QDockWidget):
             q_image = QImage(frame_to_display.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
             pixmap = QPixmap.fromImage(q_image)
             scaled_pixmap = pixmap.scaled(
-                self.display_label.size(),
+                display_label.size(),
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
             )
-            self.display_label.setPixmap(scaled_pixmap)
+            display_label.setPixmap(scaled_pixmap)
         else:
-            display_frame(frame_to_display, self.display_label, main_window)
+            display_frame(frame_to_display, display_label, main_window, camera_id)
 
     def reset_display(self):
         main_window = self.parent().window()
         if hasattr(main_window, 'camera_manager'):
-            current_frame = main_window.camera_manager.current_image
-            if current_frame is not None:
-                frame_rgb = cv2.cvtColor(current_frame, cv2.COLOR_BGR2RGB)
-                self.update_display(frame_rgb, clear_markers=True)
+            for camera_id in list(self.display_labels):
+                current_frame = main_window.camera_manager.current_image_for(camera_id)
+                if current_frame is not None:
+                    frame_rgb = cv2.cvtColor(current_frame, cv2.COLOR_BGR2RGB)
+                    self.update_display(camera_id, frame_rgb, clear_markers=True)
 
     def update_camera_button_text(self, is_running):
         self.camera_button.setText("Stop Camera" if is_running else "Start Camera")
         self.camera_button.set_active(is_running)
+        self.add_camera_button.setEnabled(is_running)
 
     def get_selected_camera(self):
         return self.camera_combo.currentText()
@@ -12,6 +12,7 @@ from .signal_handler import (
     handle_detection_stop,
     handle_detection_status_change,
     handle_camera_toggle,
+    handle_camera_add,
 )
 from .detection_handler import (
     process_detections,
@@ -55,11 +56,14 @@ class MainWindow(QMainWindow):
     def _toggle_camera(self):
         handle_camera_toggle(self)
 
+    def _add_camera(self):
+        handle_camera_add(self)
+
     def _toggle_detection(self):
         handle_detection_toggle(self)
 
-    def _process_detections(self, detections):
-        process_detections(self, detections)
+    def _process_detections(self, camera_id, detections):
+        process_detections(self, camera_id, detections)
 
     def _generate_pdf(self):
         generate_pdf(self)
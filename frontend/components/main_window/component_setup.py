@@ -21,14 +21,14 @@ def setup_base_components(window, proctor_name=None, email=None):
 
 def setup_model_components(window):
     rf = window.app_state.roboflow
-    if rf is None or not rf.model or not rf.classes:
-        handle_model_error(window, "Roboflow not properly initialized or missing model/classes.")
+    if rf is None or not rf.model_config or not rf.classes:
+        handle_model_error(window, "Detection model not properly initialized or missing model/classes.")
         return False
     
     if not hasattr(window, "detection_manager"):
-        window.detection_manager = DetectionManager(rf.model, window)
+        window.detection_manager = DetectionManager(rf.model_config, window)
     else:
-        window.detection_manager.model = rf.model
+        window.detection_manager.set_model(rf.model_config)
     
     window.detection_controls.update_model_classes(rf.classes)
     return True
@@ -4,25 +4,25 @@ from frontend.components.loading_dialog import LoadingDialog
 
 logger = logging.getLogger("detection")
 
-def process_detections(window, detections):
+def process_detections(window, camera_id, detections):
     selected_class = window.get_selected_capture_class()
     if not selected_class:
-        window.camera_display.update_display(clear_markers=True)
+        window.camera_display.update_display(camera_id, clear_markers=True)
         return
 
-    window.status_bar.update_detections_count(len(detections))
+    window.status_bar.update_detections_count(len(window.detection_manager.detections))
     if not detections:
-        window.camera_display.update_display(clear_markers=True)
+        window.camera_display.update_display(camera_id, clear_markers=True)
         return
 
-    current_image = window.camera_manager.current_image
+    current_image = window.camera_manager.current_image_for(camera_id)
     if current_image is None:
-        logger.warning("Cannot capture image, current_image is None.")
+        logger.warning(f"Cannot capture image, current_image for camera {camera_id} is None.")
         return
 
     for detection in detections:
         if detection["class"] == selected_class:
-            ImageCaptureManager.capture_image(detection, current_image, window)
+            ImageCaptureManager.capture_image(detection, current_image, window, camera_id)
 
 def handle_detection_toggle(window):
     def toggle_task():
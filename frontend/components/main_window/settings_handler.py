@@ -1,5 +1,8 @@
 from frontend.components.loading_dialog import LoadingDialog
+from backend.services.detection_backends import get_model_settings
+import config.settings_manager as settings_manager
 import logging
+from pathlib import Path
 
 rlogger = logging.getLogger("report")
 clogger = logging.getLogger("camera")
@@ -12,13 +15,32 @@ def handle_settings_update(window):
             if hasattr(window, "detection_manager") and getattr(window.detection_manager, "detection_active", False):
                 window.detection_manager.toggle_detection(force_stop=True)
             window.camera_manager.stop_camera()
+        if _model_settings_changed(window):
+            dlogger.info("Detection model settings changed, re-initializing model...")
+            window.app_state.reinitialize_roboflow()
+
+    def on_done():
+        if hasattr(window, "camera_manager") and window.camera_manager:
+            window.camera_manager.refresh_cameras()
+        setup_model(window)
 
     LoadingDialog.show_loading(
         window,
         "Re-initializing settings...",
         do_update,
+        on_done,
     )
 
+def _model_settings_changed(window):
+    rf = window.app_state.roboflow
+    current = rf.model_config if rf else None
+    if not current:
+        return True
+    model_settings = get_model_settings(settings_manager)
+    if model_settings['path']:
+        model_settings['path'] = str(Path(model_settings['path']))
+    return any(current.get(key, value) != value for key, value in model_settings.items())
+
 def setup_model(window):
     from .component_setup import setup_model_components
     return setup_model_components(window)
@@ -31,13 +53,12 @@ def cleanup_resources(window):
             dlogger.info("Stopping detection first...")
             window.detection_manager.toggle_detection(force_stop=True)
         window.camera_manager.stop_camera()
-    else:
-        if hasattr(window, "detection_manager") and window.detection_manager:
-            dlogger.info("Cleaning up DetectionManager...")
-            window.detection_manager.cleanup()
-        if hasattr(window, "camera_manager") and window.camera_manager:
-            clogger.info("Cleaning up CameraManager...")
-            window.camera_manager.cleanup()
+    if hasattr(window, "detection_manager") and window.detection_manager:
+        dlogger.info("Cleaning up DetectionManager...")
+        window.detection_manager.cleanup()
+    if hasattr(window, "camera_manager") and window.camera_manager:
+        clogger.info("Cleaning up CameraManager...")
+        window.camera_manager.cleanup()
 
     if hasattr(window, "report_manager"):
         rlogger.info("Cleaning up ReportManager...")
@@ -13,10 +13,17 @@ def connect_signals(window):
     window.detection_manager.detection_status_changed.connect(window._on_detection_status_changed)
     window.detection_manager.detection_started.connect(window._on_detection_started)
     window.detection_manager.detection_start_failed.connect(window._on_detection_start_failed)
+    window.detection_manager.detection_rate_changed.connect(window.status_bar.update_detection_fps)
     window.camera_manager.camera_start_failed.connect(lambda msg: handle_camera_start_failure(window, msg))
     window.camera_manager.camera_started.connect(lambda: handle_camera_started(window))
     window.camera_manager.camera_stopped.connect(lambda: handle_camera_stopped(window))
+    window.camera_manager.feed_added.connect(window.camera_display.add_pane)
+    window.camera_manager.feed_added.connect(window.detection_manager.add_feed)
+    window.camera_manager.feed_removed.connect(window.detection_manager.remove_feed)
+    window.camera_manager.feed_removed.connect(window.camera_display.remove_pane)
+    window.camera_manager.fps_updated.connect(window.status_bar.update_camera_fps)
     window.camera_display.camera_toggle_requested.connect(window._toggle_camera)
+    window.camera_display.camera_add_requested.connect(window._add_camera)
     window.detection_controls.detection_toggle_requested.connect(window._toggle_detection)
     window.report_manager.pdf_generation_requested.connect(window._generate_pdf)
     window.detection_controls.confidence_changed.connect(
@@ -43,6 +50,7 @@ def handle_camera_started(window):
 def handle_camera_stopped(window):
     window.camera_display.update_camera_button_text(False)
     window.detection_controls.set_detection_enabled(False)
+    window.status_bar.update_camera_fps({})
     clogger.info("Camera stopped")
 
 def handle_camera_start_failure(window, error_message):
@@ -65,3 +73,8 @@ def handle_camera_toggle(window):
         camera_active = getattr(window.camera_manager, "camera_active", False)
         window.detection_controls.set_detection_enabled(camera_active)
     LoadingDialog.show_loading(window, "Toggling camera...", toggle_task, logger_name="camera")
+
+def handle_camera_add(window):
+    def add_task():
+        window.camera_manager.add_feed()
+    LoadingDialog.show_loading(window, "Adding camera...", add_task, logger_name="camera")
@@ -38,14 +38,22 @@ class ReportManagerDock(QDockWidget):
         self.file_watcher = QFileSystemWatcher()
         self.file_watcher.addPath(str(self.temp_dir))
         self.file_watcher.directoryChanged.connect(self._handle_directory_change)
+        self._watch_subdirectories()
         self._load_existing_images()
 
     def _load_existing_images(self):
         self._rebuild_image_layout()
 
+    def _watch_subdirectories(self):
+        watched = set(self.file_watcher.directories())
+        for directory in self.temp_dir.iterdir():
+            if directory.is_dir() and str(directory) not in watched:
+                self.file_watcher.addPath(str(directory))
+
     def _handle_directory_change(self, path):
         if self._cleaned_up:
             return
+        self._watch_subdirectories()
         self._rebuild_image_layout()
 
     def _rebuild_image_layout(self):
@@ -57,7 +65,7 @@ class ReportManagerDock(QDockWidget):
             if widget:
                 widget.deleteLater()
 
-        image_files = list(self.temp_dir.glob("*.jpg"))
+        image_files = list(self.temp_dir.rglob("*.jpg"))
         untagged = []
         tagged = []
 
@@ -106,8 +114,8 @@ class ReportManagerDock(QDockWidget):
         except Exception as e:
             self.logger.error(f"Error disconnecting file watcher: {e}")
             pass
-        self.file_watcher.removePath(str(self.temp_dir))
+        self.file_watcher.removePaths(self.file_watcher.directories())
         if self.temp_dir.exists():
-            for file in self.temp_dir.iterdir():
+            for file in self.temp_dir.rglob("*"):
                 if file.is_file():
                     file.unlink()
@@ -10,6 +10,10 @@ class StatusBarManager:
         self.status_bar.addWidget(self.connection_label)
         self.detected_objects_label = QLabel("Detected Objects: 0")
         self.status_bar.addWidget(self.detected_objects_label)
+        self.camera_fps_label = QLabel("")
+        self.status_bar.addWidget(self.camera_fps_label)
+        self.detection_fps_label = QLabel("")
+        self.status_bar.addWidget(self.detection_fps_label)
         self.proctor_info_label = QLabel("")
         if proctor_name and email:
             self.proctor_info_label.setText(
@@ -25,6 +29,16 @@ class StatusBarManager:
     def update_detections_count(self, count):
         self.detected_objects_label.setText(f"Detected Students: {count}")
 
+    def update_camera_fps(self, rates):
+        if not rates:
+            self.camera_fps_label.setText("")
+            return
+        text = " | ".join(f"Cam {camera_id + 1}: {rate['publish_fps']:.0f}/{rate['grab_fps']:.0f} fps" for camera_id, rate in sorted(rates.items()))
+        self.camera_fps_label.setText(text)
+
+    def update_detection_fps(self, fps, skipped=0):
+        self.detection_fps_label.setText(f"Detection: {fps:.1f} fps, {skipped} frames skipped" if fps > 0 else "")
+
     def set_detection_status(self, status):
         if status == "connected":
             self._stop_blink()
@@ -0,0 +1,80 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.deduplication_utils import DeadzoneGrid, DEADZONE_SIZE, DEADZONE_DURATION
+
+FRAME_WIDTH = 1280
+FRAME_HEIGHT = 720
+CLASSES = ["cheating", "student"]
+
+class LinearDeadzones:
+    def __init__(self):
+        self._deadzones = []
+
+    def __len__(self):
+        return len(self._deadzones)
+
+    def add(self, x, y, class_name, timestamp):
+        self._deadzones.append({'x': x, 'y': y, 'class': class_name, 'timestamp': timestamp})
+
+    def expire(self, now):
+        before = len(self._deadzones)
+        self._deadzones = [dz for dz in self._deadzones if now - dz['timestamp'] < DEADZONE_DURATION]
+        return before - len(self._deadzones)
+
+    def contains(self, x, y, class_name, now=None):
+        for dz in self._deadzones:
+            if class_name == dz['class'] and abs(x - dz['x']) <= DEADZONE_SIZE // 2 and abs(y - dz['y']) <= DEADZONE_SIZE // 2:
+                return True
+        return False
+
+def _workload(deadzones, batches, students, seed):
+    rng = random.Random(seed)
+    steps = []
+    for step in range(batches):
+        detections = [(rng.uniform(0, FRAME_WIDTH), rng.uniform(0, FRAME_HEIGHT), rng.choice(CLASSES)) for _ in range(students)]
+        steps.append((step * 0.2, detections))
+    seeded = [(rng.uniform(0, FRAME_WIDTH), rng.uniform(0, FRAME_HEIGHT), rng.choice(CLASSES), -rng.uniform(0, DEADZONE_DURATION)) for _ in range(deadzones)]
+    return seeded, steps
+
+def _run(store, seeded, steps):
+    for x, y, class_name, timestamp in seeded:
+        store.add(x, y, class_name, timestamp)
+    hits = 0
+    started = time.perf_counter()
+    for now, detections in steps:
+        store.expire(now)
+        captured = False
+        for x, y, class_name in detections:
+            if store.contains(x, y, class_name, now):
+                hits += 1
+            elif not captured:
+                store.add(x, y, class_name, now)
+                captured = True
+    return time.perf_counter() - started, hits
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare deadzone lookup/expiry against the linear scan")
+    parser.add_argument("--deadzones", type=int, nargs="+", default=[10, 100, 500, 2000])
+    parser.add_argument("--students", type=int, default=60)
+    parser.add_argument("--batches", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'deadzones':>10} {'linear us/det':>14} {'grid us/det':>12} {'speedup':>8}")
+    for count in args.deadzones:
+        seeded, steps = _workload(count, args.batches, args.students, args.seed)
+        detections = args.batches * args.students
+        linear_time, linear_hits = _run(LinearDeadzones(), seeded, steps)
+        grid_time, grid_hits = _run(DeadzoneGrid(), seeded, steps)
+        if linear_hits != grid_hits:
+            raise SystemExit(f"Mismatch at {count} deadzones: linear {linear_hits} hits, grid {grid_hits} hits")
+        print(f"{count:>10} {linear_time / detections * 1e6:>14.2f} {grid_time / detections * 1e6:>12.2f} {linear_time / grid_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
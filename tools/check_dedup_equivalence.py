@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.utils.deduplication_utils import DetectionDeduplicator, DEADZONE_SIZE
+
+CAPTURE_CLASS = "cheating"
+CLASSES = [CAPTURE_CLASS, "student"]
+SPANS = [DEADZONE_SIZE, 3 * DEADZONE_SIZE, 1280]
+CONFIDENCES = [0.5, 0.7]
+
+def legacy_dedup_same_class(predictions, capture_class):
+    result = []
+    seen = []
+    for det in sorted(predictions, key=lambda d: -d.get('confidence', 0)):
+        if det['class'] == capture_class:
+            duplicate = False
+            for s in seen:
+                if (
+                    abs(det['x'] - s['x']) <= DEADZONE_SIZE // 2 and
+                    abs(det['y'] - s['y']) <= DEADZONE_SIZE // 2
+                ):
+                    duplicate = True
+                    break
+            if not duplicate:
+                seen.append(det)
+                result.append(det)
+        else:
+            result.append(det)
+    return result
+
+def _coordinate(rng, span):
+    if rng.random() < 0.5:
+        return float(rng.randint(0, span // 10) * 10)
+    return rng.uniform(0, span)
+
+def random_batch(rng, max_size):
+    span = rng.choice(SPANS)
+    return [
+        {
+            'x': _coordinate(rng, span),
+            'y': _coordinate(rng, span),
+            'width': rng.uniform(10, 120),
+            'height': rng.uniform(10, 160),
+            'confidence': rng.choice(CONFIDENCES + [rng.random()]),
+            'class': rng.choice(CLASSES)
+        }
+        for _ in range(rng.randint(0, max_size))
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that vectorized same-class suppression matches the original loop")
+    parser.add_argument("--batches", type=int, default=5000)
+    parser.add_argument("--max-size", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    deduplicator = DetectionDeduplicator()
+    for index in range(args.batches):
+        batch = random_batch(rng, args.max_size)
+        expected = legacy_dedup_same_class(batch, CAPTURE_CLASS)
+        actual = deduplicator._dedup_same_class(batch, CAPTURE_CLASS)
+        if [id(det) for det in expected] != [id(det) for det in actual]:
+            raise SystemExit(f"Mismatch in batch {index} (seed {args.seed}): expected {expected}, got {actual}")
+    print(f"{args.batches} random batches identical to the original center-distance loop (seed {args.seed})")
+
+if __name__ == "__main__":
+    main()